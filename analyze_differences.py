@@ -1,18 +1,20 @@
 #!/usr/bin/env python3
 """Analyze how each CV is treated differently across models and pipelines."""
-import json
+import orjson
 import pandas as pd
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List
 import argparse
 
 
+@lru_cache(maxsize=1)
 def load_mapping() -> Dict[str, Dict]:
     """Load CV ID mapping."""
     mapping_path = Path(__file__).parent / "data" / "cv_id_mapping.json"
-    with open(mapping_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return orjson.loads(mapping_path.read_bytes())
 
 
 def get_original_info(sanitized_id: str, mapping: Dict) -> Dict:
@@ -32,82 +34,100 @@ def analyze_experiment(experiment_dir: Path, output_file: str = None):
         print(f"Error: comparison.csv not found in {experiment_dir}")
         return
     
-    df = pd.read_csv(comparison_path)
-    
-    # Add original IDs and names
-    df['original_id'] = df['cv_id'].apply(
-        lambda x: get_original_info(x, mapping)['original_id']
-    )
-    df['original_name'] = df['cv_id'].apply(
-        lambda x: get_original_info(x, mapping)['original_name']
+    # Multi-threaded Arrow CSV reader, projected down to the only columns
+    # the analysis actually touches
+    df = pd.read_csv(
+        comparison_path,
+        engine='pyarrow',
+        usecols=['cv_id', 'pipeline', 'model', 'ranking']
     )
+
+    # Strings are the dominant memory cost; category codes are small ints,
+    # which also makes the repeated groupby/unique/value_counts much cheaper
+    for col in ('cv_id', 'pipeline', 'model'):
+        df[col] = df[col].astype('category')
+    df['ranking'] = pd.to_numeric(df['ranking'], downcast='integer')
+
+    # Add original IDs and names via vectorized map (one hash lookup per
+    # column) instead of a Python-level apply per row
+    original_id_map = {k: v['original_id'] for k, v in mapping.items()}
+    original_name_map = {k: v['original_name'] for k, v in mapping.items()}
+    df['original_id'] = df['cv_id'].map(original_id_map).fillna(df['cv_id'])
+    df['original_name'] = df['cv_id'].map(original_name_map).fillna('Unknown')
+
+    # One per-CV lookup table, read back in the loop instead of re-querying
+    # the mapping dict for every CV
+    cv_meta = df.drop_duplicates('cv_id').set_index('cv_id')[['original_id', 'original_name']]
     
     # Create analysis output
     analysis = []
-    
-    # Group by CV to see variation
-    for cv_id in df['cv_id'].unique():
-        cv_data = df[df['cv_id'] == cv_id]
-        original_info = get_original_info(cv_id, mapping)
-        
-        rankings = cv_data['ranking'].tolist()
-        unique_rankings = sorted(set(rankings))
-        ranking_counts = cv_data['ranking'].value_counts().to_dict()
-        
-        # Get breakdown by pipeline
-        pipeline_rankings = {}
-        for pipeline in cv_data['pipeline'].unique():
-            pipeline_data = cv_data[cv_data['pipeline'] == pipeline]
-            pipeline_rankings[pipeline] = {
-                'rankings': pipeline_data['ranking'].tolist(),
-                'models': pipeline_data['model'].tolist(),
-                'avg_ranking': pipeline_data['ranking'].mean()
-            }
-        
-        # Get breakdown by model
-        model_rankings = {}
-        for model in cv_data['model'].unique():
-            model_data = cv_data[cv_data['model'] == model]
-            model_rankings[model] = {
-                'rankings': model_data['ranking'].tolist(),
-                'pipelines': model_data['pipeline'].tolist(),
-                'avg_ranking': model_data['ranking'].mean()
-            }
-        
-        # Calculate variance metrics
-        ranking_variance = cv_data['ranking'].var()
-        ranking_std = cv_data['ranking'].std()
-        min_ranking = cv_data['ranking'].min()
-        max_ranking = cv_data['ranking'].max()
-        ranking_range = max_ranking - min_ranking
-        
-        analysis.append({
-            'cv_id': cv_id,
-            'original_id': original_info['original_id'],
-            'name': original_info['original_name'],
-            'total_evaluations': len(rankings),
-            'unique_rankings': unique_rankings,
-            'ranking_distribution': ranking_counts,
-            'min_ranking': int(min_ranking),
-            'max_ranking': int(max_ranking),
-            'ranking_range': int(ranking_range),
-            'avg_ranking': round(cv_data['ranking'].mean(), 2),
-            'ranking_variance': round(ranking_variance, 2),
-            'ranking_std': round(ranking_std, 2),
-            'by_pipeline': pipeline_rankings,
-            'by_model': model_rankings
-        })
-    
+
+    # Aggregate everything in single groupby passes instead of re-filtering
+    # the DataFrame once per CV (which scans all rows for every CV)
+    agg = df.groupby('cv_id', observed=True)['ranking'].agg(['min', 'max', 'mean', 'var', 'std', 'count'])
+    # List aggregation needs object dtype for the value column (categorical
+    # columns can't hold list results), but the group keys stay categorical
+    pipeline_agg = df.groupby(['cv_id', 'pipeline'], observed=True)['ranking'].agg(
+        rankings=list, avg_ranking='mean'
+    )
+    pipeline_agg['models'] = df['model'].astype(object).groupby(
+        [df['cv_id'], df['pipeline']], observed=True
+    ).agg(list)
+    model_agg = df.groupby(['cv_id', 'model'], observed=True)['ranking'].agg(
+        rankings=list, avg_ranking='mean'
+    )
+    model_agg['pipelines'] = df['pipeline'].astype(object).groupby(
+        [df['cv_id'], df['model']], observed=True
+    ).agg(list)
+    distribution = df.groupby(['cv_id', 'ranking'], observed=True).size().unstack(fill_value=0)
+
+    # Nested per-CV breakdowns live in a side map; the numeric stats stay
+    # columnar in a DataFrame so the variance sort is one numpy sort rather
+    # than a Python list.sort over dict lookups
+    pipeline_agg = pipeline_agg[['rankings', 'models', 'avg_ranking']]
+    model_agg = model_agg[['rankings', 'pipelines', 'avg_ranking']]
+    breakdowns = {
+        cv_id: {
+            'by_pipeline': pipeline_agg.loc[cv_id].to_dict(orient='index'),
+            'by_model': model_agg.loc[cv_id].to_dict(orient='index')
+        }
+        for cv_id in agg.index
+    }
+
     # Sort by variance (most disagreement first)
-    analysis.sort(key=lambda x: x['ranking_variance'], reverse=True)
-    
+    stats_df = agg.join(cv_meta).sort_values('var', ascending=False, kind='stable')
+
     # Print analysis
     print("=" * 80)
     print("CV ANALYSIS: How Each Candidate is Treated Differently")
     print("=" * 80)
     print()
-    
-    for item in analysis:
+
+    for row in stats_df.itertuples():
+        cv_id = row.Index
+
+        # Nonzero entries of the distribution row give counts and unique values
+        dist_row = distribution.loc[cv_id]
+        ranking_counts = {int(r): int(c) for r, c in dist_row.items() if c > 0}
+
+        item = {
+            'cv_id': cv_id,
+            'original_id': row.original_id,
+            'name': row.original_name,
+            'total_evaluations': int(row.count),
+            'unique_rankings': sorted(ranking_counts),
+            'ranking_distribution': ranking_counts,
+            'min_ranking': int(row.min),
+            'max_ranking': int(row.max),
+            'ranking_range': int(row.max - row.min),
+            'avg_ranking': round(row.mean, 2),
+            'ranking_variance': round(row.var, 2),
+            'ranking_std': round(row.std, 2),
+            'by_pipeline': breakdowns[cv_id]['by_pipeline'],
+            'by_model': breakdowns[cv_id]['by_model']
+        }
+        analysis.append(item)
+
         print(f"CV: {item['name']} ({item['original_id']})")
         print(f"  Sanitized ID: {item['cv_id']}")
         print(f"  Total Evaluations: {item['total_evaluations']}")
@@ -130,67 +150,76 @@ def analyze_experiment(experiment_dir: Path, output_file: str = None):
         print("-" * 80)
         print()
     
-    # Create summary table
-    summary_df = pd.DataFrame([
-        {
-            'Original ID': item['original_id'],
-            'Name': item['name'],
-            'Sanitized ID': item['cv_id'],
-            'Min': item['min_ranking'],
-            'Max': item['max_ranking'],
-            'Range': item['ranking_range'],
-            'Avg': item['avg_ranking'],
-            'Std Dev': item['ranking_std'],
-            'Variance': item['ranking_variance']
-        }
-        for item in analysis
-    ])
+    # Create summary table column-wise from the precomputed aggregation
+    # frame instead of rebuilding it row-by-row from the analysis dicts
+    summary_df = pd.DataFrame({
+        'Original ID': agg.index.map(lambda c: original_id_map.get(c, c)),
+        'Name': agg.index.map(lambda c: original_name_map.get(c, 'Unknown')),
+        'Sanitized ID': agg.index,
+        'Min': agg['min'].astype(int).values,
+        'Max': agg['max'].astype(int).values,
+        'Range': (agg['max'] - agg['min']).astype(int).values,
+        'Avg': agg['mean'].round(2).values,
+        'Std Dev': agg['std'].round(2).values,
+        'Variance': agg['var'].round(2).values
+    }).sort_values('Variance', ascending=False, kind='stable', ignore_index=True)
     
     print("\nSUMMARY TABLE (sorted by variance - most disagreement first):")
     print("=" * 80)
     print(summary_df.to_string(index=False))
     print()
     
-    # Save detailed analysis
-    if output_file:
-        output_path = experiment_dir / output_file
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(analysis, f, indent=2)
-        print(f"\nDetailed analysis saved to: {output_path}")
-    
-    # Save summary CSV
-    summary_csv_path = experiment_dir / "cv_differences_summary.csv"
-    summary_df.to_csv(summary_csv_path, index=False)
-    print(f"Summary table saved to: {summary_csv_path}")
-    
-    # Create pivot table: CV vs Pipeline/Model combinations
-    print("\n" + "=" * 80)
-    print("PIVOT TABLE: Ranking by CV and Pipeline-Model Combination")
-    print("=" * 80)
-    
-    df['pipeline_model'] = df['pipeline'] + ' / ' + df['model']
-    pivot = df.pivot_table(
-        values='ranking',
+    # Pre-order the pipeline/model combinations as an ordered categorical:
+    # one_shot, chain_of_thought, decomposed_algorithmic, multi_layer, with
+    # models sorted within each pipeline and unmatched combinations last.
+    # pivot then emits columns already in category order (and, with unique
+    # keys, skips pivot_table's aggregation scan entirely)
+    pipeline_order = ['one_shot', 'chain_of_thought', 'decomposed_algorithmic', 'multi_layer']
+    pm_values = df['pipeline'].astype(str) + ' / ' + df['model'].astype(str)
+    pm_categories = [
+        f"{pipeline} / {model}"
+        for pipeline in pipeline_order
+        for model in sorted(df.loc[df['pipeline'] == pipeline, 'model'].unique())
+    ]
+    pm_categories += sorted(set(pm_values) - set(pm_categories))
+    df['pipeline_model'] = pd.Categorical(pm_values, categories=pm_categories, ordered=True)
+
+    pivot = df.pivot(
         index=['original_id', 'original_name'],
         columns='pipeline_model',
-        aggfunc='first'
+        values='ranking'
     )
 
-    # Reorder columns: one_shot, chain_of_thought, decomposed_algorithmic, multi_layer
-    pipeline_order = ['one_shot', 'chain_of_thought', 'decomposed_algorithmic', 'multi_layer']
-    ordered_cols = []
-    for pipeline in pipeline_order:
-        pipeline_cols = [col for col in pivot.columns if col.startswith(pipeline + ' /')]
-        ordered_cols.extend(sorted(pipeline_cols))
+    # The three output files are independent and purely I/O bound; write
+    # them from worker threads while the main thread renders the pivot
+    summary_csv_path = experiment_dir / "cv_differences_summary.csv"
+    pivot_csv_path = experiment_dir / "cv_rankings_pivot.csv"
+    output_path = experiment_dir / output_file if output_file else None
 
-    # Reindex with ordered columns (keep any columns not matched)
-    remaining_cols = [col for col in pivot.columns if col not in ordered_cols]
-    pivot = pivot.reindex(columns=ordered_cols + remaining_cols)
+    def write_analysis_json():
+        # orjson emits bytes directly (no intermediate str) and handles the
+        # numpy scalars and int dict keys left over from the aggregation
+        with open(output_path, 'wb') as f:
+            f.write(orjson.dumps(
+                analysis,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            ))
 
-    print(pivot.to_string())
-    
-    pivot_csv_path = experiment_dir / "cv_rankings_pivot.csv"
-    pivot.to_csv(pivot_csv_path)
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        if output_path is not None:
+            executor.submit(write_analysis_json)
+        executor.submit(summary_df.to_csv, summary_csv_path, index=False)
+        executor.submit(pivot.to_csv, pivot_csv_path)
+
+        # Print pivot table: CV vs Pipeline/Model combinations
+        print("\n" + "=" * 80)
+        print("PIVOT TABLE: Ranking by CV and Pipeline-Model Combination")
+        print("=" * 80)
+        print(pivot.to_string())
+
+    if output_path is not None:
+        print(f"\nDetailed analysis saved to: {output_path}")
+    print(f"Summary table saved to: {summary_csv_path}")
     print(f"\nPivot table saved to: {pivot_csv_path}")
 
 
@@ -1,9 +1,10 @@
 #!/usr/bin/env python3
 """Check which OpenAI models are available in your API account."""
+import asyncio
 import os
 import sys
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import AsyncOpenAI
 
 load_dotenv()
 
@@ -12,7 +13,7 @@ if not api_key:
     print("Error: OPENAI_API_KEY not found in .env file")
     sys.exit(1)
 
-client = OpenAI(api_key=api_key)
+client = AsyncOpenAI(api_key=api_key)
 
 print("Checking available OpenAI models...")
 print("=" * 60)
@@ -30,22 +31,38 @@ models_to_check = [
     "gpt-5.2-pro",
 ]
 
+# Bound concurrency so the burst of probes doesn't trip per-second rate limits
+semaphore = asyncio.Semaphore(8)
+
+
+async def probe_model(model: str):
+    """Try a minimal completion to test if a model is available."""
+    async with semaphore:
+        try:
+            await client.chat.completions.create(
+                model=model,
+                messages=[{"role": "user", "content": "test"}],
+                max_tokens=5
+            )
+            return model, True, None
+        except Exception as e:
+            return model, False, str(e)
+
+
+async def probe_all():
+    """Probe all models concurrently instead of one blocking call at a time."""
+    return await asyncio.gather(*(probe_model(m) for m in models_to_check))
+
+
 available_models = []
 unavailable_models = []
 
-for model in models_to_check:
-    try:
-        # Try a simple completion to test if model is available
-        response = client.chat.completions.create(
-            model=model,
-            messages=[{"role": "user", "content": "test"}],
-            max_tokens=5
-        )
+for model, is_available, error_msg in asyncio.run(probe_all()):
+    if is_available:
         available_models.append(model)
         print(f"✓ {model}: Available")
-    except Exception as e:
+    else:
         unavailable_models.append(model)
-        error_msg = str(e)
         if "model_not_found" in error_msg.lower() or "does not exist" in error_msg.lower():
             print(f"✗ {model}: Not found")
         elif "rate limit" in error_msg.lower():
@@ -62,4 +79,3 @@ if available_models:
     print("models:")
     for model in available_models:
         print(f"  - \"{model}\"")
-
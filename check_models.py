@@ -1,10 +1,32 @@
 #!/usr/bin/env python3
 """Check available models for each provider."""
 import os
+import time
+from pathlib import Path
+
+import orjson
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Model listings barely change; cache them for a day so repeat runs skip
+# the network round-trip entirely
+CACHE_DIR = Path("~/.cache/llm_tests").expanduser()
+CACHE_TTL_SECONDS = 86400
+
+
+def cached_model_list(cache_name: str, fetch):
+    """Return a cached model list if fresh, otherwise fetch and cache it."""
+    cache_path = CACHE_DIR / cache_name
+    if cache_path.exists() and time.time() - cache_path.stat().st_mtime < CACHE_TTL_SECONDS:
+        return orjson.loads(cache_path.read_bytes())
+
+    models = fetch()
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    cache_path.write_bytes(orjson.dumps(models))
+    return models
+
+
 print("Checking available models for each provider...")
 print("=" * 60)
 
@@ -12,9 +34,13 @@ print("=" * 60)
 print("\nOpenAI Models:")
 try:
     from openai import OpenAI
-    client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-    models = client.models.list()
-    openai_models = [m.id for m in models.data if 'gpt' in m.id.lower()]
+
+    def fetch_openai_models():
+        client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        return [m.id for m in client.models.list().data]
+
+    all_models = cached_model_list("openai_models.json", fetch_openai_models)
+    openai_models = [m for m in all_models if 'gpt' in m.lower()]
     for model in sorted(openai_models)[:10]:  # Show first 10
         print(f"  - {model}")
 except Exception as e:
@@ -24,14 +50,20 @@ except Exception as e:
 print("\nGemini Models:")
 try:
     import google.generativeai as genai
-    genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-    models = genai.list_models()
+
+    def fetch_gemini_models():
+        genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+        return [
+            m.name for m in genai.list_models()
+            if 'generateContent' in m.supported_generation_methods
+        ]
+
+    gemini_models = cached_model_list("gemini_models.json", fetch_gemini_models)
     print("  Available models:")
-    for model in models:
-        if 'generateContent' in model.supported_generation_methods:
-            # Extract just the model name (remove 'models/' prefix)
-            model_name = model.name.replace('models/', '')
-            print(f"  - {model_name} (full: {model.name})")
+    for full_name in gemini_models:
+        # Extract just the model name (remove 'models/' prefix)
+        model_name = full_name.replace('models/', '')
+        print(f"  - {model_name} (full: {full_name})")
 except Exception as e:
     print(f"  Error: {e}")
     print("  Try these common model names:")
@@ -60,4 +92,3 @@ except Exception as e:
     print(f"  Error: {e}")
 
 print("\n" + "=" * 60)
-
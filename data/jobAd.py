@@ -1,111 +0,0 @@
-job_ad = """
-
-Job description:
-
-# 🚀 Founding Operator
-
-## 🏢 About Us
-
-The company is an AI recruitment startup building the infrastructure for the future labour market with two agentic products: An AI career agent for candidates and an AI talent partner for companies. We've raised from top VCs, have tens of thousands of candidates, and are growing rapidly.
-
-## 💼 The Role
-
-- 🎯 Own the AI recruiter customer experience post-sale, combining account management, customer success, data/analytics, and product management
-- 🔧 Diagnose problems, build v1 solutions manually, then automate and scale them
-- 🤝 Work directly with the CEO in the Founder's Office as a force multiplier across the company's highest-leverage challenges
-- ⚡ Mission will evolve rapidly as company needs change - expect to move between different areas of the business
-
-
-Hiring criteria:
-
-## 🛠️ Zero-to-One Operator
-- Proven hands-on experience building operational systems from scratch in early-stage, high-growth startups, demonstrating a "diagnose, build, then scale" mindset
-- High-agency problem solver who can flex from strategy to execution
-
-## 🔬 Technical T-Shape
-- Sufficient technical or analytical depth to partner with engineers on product and small-scale automation
-- AI power user who actively uses AI tools to 10x output
-
-## 👥 Recruitment Mastery
-- Deep expertise in end-to-end recruitment, particularly within early-stage or high-growth technology companies
-- Built and optimised hiring pipelines from scratch
-
-
-"""
-
-detailed_hiring_criteria = """
-
-#Zero-to-One Operator
-## Excellent:
-
-Founded venture-backed company with traction (£100K+ ARR, Series A+, or exit)
-First 10 employees at startup reaching product-market fit
-Built entirely new functions/business units from zero
-
-## Good:
-
-Early founding team (first 20-50 hires) with meaningful traction
-Led 0→1 initiatives requiring building infrastructure from scratch
-Bootstrapped ventures reaching real users/revenue
-
-## Weak:
-
-Corporate backgrounds without startup exposure
-Joined post-Series B when processes existed
-Advisory-only without hands-on execution
-
-## Not a Fit:
-
-5+ years exclusively at Fortune 500 with no startup involvement
-Purely advisory roles
-Stated preference for corporate structure
-Junior/mid-level roles without demonstrable startup experience
-
-
-# Technical T-Shape
-## Excellent:
-
-Professional engineering/data experience shipping production systems at Series A+ startups
-Led analytics or ML product work at scale (1M+ users or Series B+)
-
-## Good:
-
-Strong data/analytics with applied product experience at tech companies or funded startups
-Comfortable prototyping automation and discussing technical trade-offs
-STEM academic background
-
-## Weak:
-
-Academic technical background without productised outcomes
-IT support or general tech roles without deep analytical contribution
-
-## Not a Fit:
-
-Uncomfortable with technical concepts or unable to work with engineers
-Non-STEM background without compensating analytical achievements
-
-
-# Recruitment Mastery
-## Excellent:
-
-Built 0→1 recruiting function (e.g., first 50 hires) at early-stage tech
-Created systems and optimized metrics (30%+ time-to-hire reduction, 20%+ offer acceptance improvement)
-Designed processes from scratch
-
-## Good:
-
-Filled e.g. 5+ roles annually with end-to-end ownership (sourcing → offer)
-Full-cycle recruitment experience in startups/tech
-Clear examples of managing hiring processes
-
-## Weak:
-
-Involved in recruiting but limited end-to-end ownership
-Indicators like "interviewed candidates," "supported hiring," "grew team through network" (informal)
-
-## Not a Fit:
-
-No evidence of recruiting at all
-CV has zero mention of hiring or interviewing
-
-"""
@@ -62,11 +62,9 @@ async def example_compare_pipelines():
         MultiLayerPipeline(provider)
     ]
     
-    # Run all pipelines
-    results = []
-    for pipeline in pipelines:
-        result = await pipeline.analyze(cv)
-        results.append(result)
+    # Run all pipelines concurrently - the calls are network-bound
+    results = list(await asyncio.gather(*(pipeline.analyze(cv) for pipeline in pipelines)))
+    for pipeline, result in zip(pipelines, results):
         print(f"{pipeline.name}: {result.analysis.get('overall_rating', 'N/A')} "
               f"({result.metadata.get('usage', {}).get('total_tokens', 0)} tokens)")
     
@@ -95,12 +93,13 @@ async def example_custom_experiment():
     one_shot = OneShotPipeline(provider)
     cot = ChainOfThoughtPipeline(provider)
     
-    # Run experiment
-    results = []
-    for cv in test_cvs:
-        print(f"Processing {cv['id']}...")
-        results.append(await one_shot.analyze(cv))
-        results.append(await cot.analyze(cv))
+    # Run experiment - all (cv, pipeline) combinations concurrently
+    print(f"Processing {len(test_cvs)} CVs across 2 pipelines...")
+    results = list(await asyncio.gather(*(
+        pipeline.analyze(cv)
+        for cv in test_cvs
+        for pipeline in (one_shot, cot)
+    )))
     
     # Save results
     framework = ComparisonFramework()
@@ -1,13 +1,25 @@
 #!/usr/bin/env python3
 """Main script to run CV analysis pipelines and compare results."""
 import asyncio
+import hashlib
 import json
 import sys
+from collections import Counter, defaultdict
+from functools import lru_cache
 from pathlib import Path
+
 from typing import List, Dict, Any
+
+import orjson
 from dotenv import load_dotenv
 import yaml
 
+try:
+    # libyaml bindings parse several times faster than the pure-Python loader
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent))
 
@@ -18,70 +30,89 @@ from src.pipelines.one_shot import OneShotPipeline
 from src.pipelines.chain_of_thought import ChainOfThoughtPipeline
 from src.pipelines.multi_layer import MultiLayerPipeline
 from src.pipelines.decomposed_algorithmic import DecomposedAlgorithmicPipeline
-from src.comparison import ComparisonFramework
+from src.comparison import ComparisonFramework, _RANKING_LABELS, _usage_tuple
 from src.pipelines.base import PipelineResult
-from src.job_data import load_job_ad, load_detailed_criteria
+from src.job_data import load_job_ad_async, load_detailed_criteria_async
 
 
+@lru_cache(maxsize=1)
 def load_config(config_path: str = "config.yaml") -> Dict[str, Any]:
     """Load configuration from YAML file."""
     with open(config_path, 'r', encoding='utf-8') as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=_YamlLoader)
 
 
+@lru_cache(maxsize=1)
 def load_cv_data(data_path: str) -> List[Dict[str, Any]]:
     """Load CV data from JSON file."""
-    with open(data_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return orjson.loads(Path(data_path).read_bytes())
 
 
-def get_provider_for_model(model: str, config: Dict[str, Any]):
-    """Determine which provider to use for a given model."""
-    # Check each provider's model list
-    for provider_name, provider_config in config['llm_providers'].items():
-        if model in provider_config.get('models', []):
-            if provider_name == 'openai':
-                return OpenAIProvider(
-                    model=model,
-                    temperature=provider_config.get('temperature', 1.0),
-                    max_tokens=provider_config.get('max_tokens', 2000)
-                )
-            elif provider_name == 'gemini':
-                return GeminiProvider(
-                    model=model,
-                    temperature=provider_config.get('temperature', 1.0),
-                    max_tokens=provider_config.get('max_tokens', 2000)
-                )
-            elif provider_name == 'anthropic':
-                return AnthropicProvider(
-                    model=model,
-                    temperature=provider_config.get('temperature', 1.0),
-                    max_tokens=provider_config.get('max_tokens', 2000)
-                )
+# Provider classes share a constructor signature, so resolution is a table
+# lookup rather than an if/elif chain
+PROVIDER_CLASSES = {
+    'openai': OpenAIProvider,
+    'gemini': GeminiProvider,
+    'anthropic': AnthropicProvider,
+}
+
+# Single source of truth for the available pipelines: the run loop and the
+# CLI choices both derive from this registry, so adding a pipeline is one
+# entry here rather than edits in two places
+PIPELINE_CLASSES = {
+    'one_shot': OneShotPipeline,
+    'chain_of_thought': ChainOfThoughtPipeline,
+    'multi_layer': MultiLayerPipeline,
+    'decomposed_algorithmic': DecomposedAlgorithmicPipeline,
+}
+
+# One provider instance per model for the lifetime of the process: repeated
+# (model, pipeline) runs then share the underlying HTTP client and its
+# keep-alive connection pool instead of re-instantiating per pipeline
+_provider_cache: Dict[str, Any] = {}
+
+# Reverse model -> provider index, built lazily from config on first lookup:
+# resolution is then one dict hit instead of a scan over every provider's
+# model list for each model in the experiment
+_model_index: Dict[str, str] = {}
+
+
+def _resolve_provider_name(model: str, config: Dict[str, Any]) -> str:
+    """Map a model name to its provider name using config, then prefixes."""
+    if not _model_index:
+        _model_index.update({
+            m: provider_name
+            for provider_name, provider_config in config['llm_providers'].items()
+            for m in provider_config.get('models', ())
+        })
+    provider_name = _model_index.get(model)
+    if provider_name is not None:
+        return provider_name
 
     # Fallback: detect provider by model name prefix
     model_lower = model.lower()
     if model_lower.startswith('gemini'):
-        provider_config = config['llm_providers'].get('gemini', {})
-        return GeminiProvider(
-            model=model,
-            temperature=provider_config.get('temperature', 1.0),
-            max_tokens=provider_config.get('max_tokens', 2000)
-        )
+        return 'gemini'
     elif model_lower.startswith('claude'):
-        provider_config = config['llm_providers'].get('anthropic', {})
-        return AnthropicProvider(
+        return 'anthropic'
+
+    # Default to OpenAI if not found
+    return 'openai'
+
+
+def get_provider_for_model(model: str, config: Dict[str, Any]):
+    """Determine which provider to use for a given model (cached per model)."""
+    provider = _provider_cache.get(model)
+    if provider is None:
+        provider_name = _resolve_provider_name(model, config)
+        provider_config = config['llm_providers'].get(provider_name, {})
+        provider = PROVIDER_CLASSES[provider_name](
             model=model,
             temperature=provider_config.get('temperature', 1.0),
             max_tokens=provider_config.get('max_tokens', 2000)
         )
-
-    # Default to OpenAI if not found
-    return OpenAIProvider(
-        model=model,
-        temperature=config['llm_providers']['openai'].get('temperature', 1.0),
-        max_tokens=config['llm_providers']['openai'].get('max_tokens', 2000)
-    )
+        _provider_cache[model] = provider
+    return provider
 
 
 async def run_experiment(
@@ -92,7 +123,8 @@ async def run_experiment(
     models: List[str] = None,
     pipelines: List[str] = None,
     cv_ids: List[str] = None,
-    providers: List[str] = None
+    providers: List[str] = None,
+    use_cache: bool = True
 ) -> List[PipelineResult]:
     """Run a complete experiment across models and pipelines."""
     load_dotenv()
@@ -121,47 +153,81 @@ async def run_experiment(
     
     if pipelines is None:
         pipelines = [name for name, settings in config['pipelines'].items() if settings.get('enabled', True)]
-    
-    results = []
+
+    # A model listed under two providers would otherwise get a provider and
+    # a full set of pipeline runs twice; dedupe preserving config order
+    models = list(dict.fromkeys(models))
+
+    # Bail out before any provider construction (the SDK clients set up
+    # httpx pools and retry config eagerly) if the filters left nothing
+    if not models or not pipelines:
+        print(f"Nothing to run (models={len(models)}, pipelines={len(pipelines)})")
+        return []
+
     total_tasks = len(models) * len(pipelines)
     completed = 0
-    
+
     print(f"Running experiment:")
     print(f"  Models: {models}")
     print(f"  Pipelines: {pipelines}")
     print(f"  CVs: {len(cv_data)}")
     print(f"  Total pipeline runs: {total_tasks}\n")
-    
-    for model in models:
-        # Create provider for this model (auto-detect based on model name)
-        try:
-            provider = get_provider_for_model(model, config)
-        except Exception as e:
-            print(f"  ✗ Error creating provider for {model}: {e}")
-            continue
-        
-        for pipeline_name in pipelines:
-            # Create pipeline
-            if pipeline_name == "one_shot":
-                pipeline = OneShotPipeline(provider)
-            elif pipeline_name == "chain_of_thought":
-                pipeline = ChainOfThoughtPipeline(provider)
-            elif pipeline_name == "multi_layer":
-                pipeline = MultiLayerPipeline(provider)
-            elif pipeline_name == "decomposed_algorithmic":
-                pipeline = DecomposedAlgorithmicPipeline(provider)
-            else:
-                print(f"Unknown pipeline: {pipeline_name}")
-                continue
-            
-            # Run pipeline on all CVs at once
+
+    # Run all (model, pipeline) combinations concurrently instead of
+    # serializing the outer loops - LLM calls are network-bound, so the
+    # only limit needed is a semaphore per provider to respect each
+    # provider's rate limits independently
+    default_concurrency = config.get('analysis', {}).get('concurrency', 4)
+    sem_by_provider = {
+        provider_name: asyncio.Semaphore(provider_config.get('concurrency', default_concurrency))
+        for provider_name, provider_config in config['llm_providers'].items()
+    }
+
+    # Content-addressed on-disk cache: repeat runs over unchanged CV data
+    # skip the network calls entirely (the dominant cost in dev loops)
+    cache_dir = Path(config.get('analysis', {}).get('cache_dir', '.pipeline_cache'))
+    if use_cache:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+    cv_data_json = json.dumps(cv_data, sort_keys=True)
+    # The prompts are built from the job ad and criteria, so both belong in
+    # the key - editing either must invalidate cached results
+    prompt_inputs_hash = hashlib.blake2b(
+        f"{job_ad}|{detailed_criteria}".encode(), digest_size=16
+    ).hexdigest()
+
+    def cache_path_for(model: str, pipeline_name: str) -> Path:
+        # blake2b is faster than sha256 on CPython and plenty for cache keys
+        key = hashlib.blake2b(
+            f"{model}|{pipeline_name}|{prompt_inputs_hash}|{cv_data_json}".encode(),
+            digest_size=16
+        ).hexdigest()
+        return cache_dir / f"{key}.json"
+
+    async def run_pipeline(model, pipeline_name, pipeline):
+        nonlocal completed
+        cache_path = cache_path_for(model, pipeline_name)
+        if use_cache and cache_path.exists():
+            completed += 1
+            print(f"Cached result for {pipeline_name} with {model} ({completed}/{total_tasks})")
+            return PipelineResult(**orjson.loads(cache_path.read_bytes()))
+
+        provider_name = pipeline.llm_provider.get_provider_name()
+        semaphore = sem_by_provider.setdefault(provider_name, asyncio.Semaphore(default_concurrency))
+        async with semaphore:
             print(f"Running {pipeline_name} with {model} on {len(cv_data)} CVs...")
             try:
-                result = await pipeline.analyze(cv_data, job_ad, detailed_criteria)
-                results.append(result)
+                # Pipelines that can score all CVs in one request take the
+                # batched path, amortizing per-call HTTP overhead
+                if pipeline.supports_batch:
+                    result = await pipeline.analyze_batch(cv_data, job_ad, detailed_criteria)
+                else:
+                    result = await pipeline.analyze(cv_data, job_ad, detailed_criteria)
+                if use_cache:
+                    cache_path.write_bytes(orjson.dumps(result.model_dump()))
                 completed += 1
                 print(f"  ✓ Completed ({completed}/{total_tasks})")
                 print(f"    Rankings: {len(result.rankings)} CVs evaluated\n")
+                return result
             except (ValueError, KeyError, json.JSONDecodeError) as e:
                 print(f"  ✗ Error: {e}\n")
                 import traceback
@@ -170,7 +236,35 @@ async def run_experiment(
                 print(f"  ✗ Unexpected error: {e}\n")
                 import traceback
                 traceback.print_exc()
-    
+            return None
+
+    tasks = []
+    for model in models:
+        # Create provider for this model (auto-detect based on model name)
+        try:
+            provider = get_provider_for_model(model, config)
+        except Exception as e:
+            print(f"  ✗ Error creating provider for {model}: {e}")
+            continue
+
+        for pipeline_name in pipelines:
+            pipeline_cls = PIPELINE_CLASSES.get(pipeline_name)
+            if pipeline_cls is None:
+                print(f"Unknown pipeline: {pipeline_name}")
+                continue
+
+            tasks.append(run_pipeline(model, pipeline_name, pipeline_cls(provider)))
+
+    task_results = await asyncio.gather(*tasks, return_exceptions=True)
+    results = []
+    for task_result in task_results:
+        if isinstance(task_result, BaseException):
+            # run_pipeline handles expected errors itself; this catches
+            # anything that escaped so one failure can't sink the gather
+            print(f"  ✗ Task failed: {task_result}")
+        elif task_result is not None:
+            results.append(task_result)
+
     return results
 
 
@@ -184,13 +278,14 @@ async def main():
     parser.add_argument("--models", nargs="+", help="Specific models to test (default: all in config)")
     parser.add_argument("--providers", nargs="+", choices=["openai", "gemini", "anthropic"],
                        help="Specific providers to test (default: all)")
-    parser.add_argument("--pipelines", nargs="+", choices=["one_shot", "chain_of_thought", "multi_layer", "decomposed_algorithmic"],
+    parser.add_argument("--pipelines", nargs="+", choices=list(PIPELINE_CLASSES),
                        help="Specific pipelines to run (default: all enabled)")
     parser.add_argument("--cv-ids", nargs="+", help="Specific CV IDs to analyze (default: all)")
     parser.add_argument("--experiment-name", help="Name for this experiment (default: auto-generated with timestamp)")
     parser.add_argument("--quick-test", action="store_true", help="Run quick test on C and D CVs (C1-C3, D1-D2)")
     parser.add_argument("--extended-test", action="store_true", help="Run extended test on A, B, C, and D CVs (A1-A3, B1-B2, C1-C3, D1-D2)")
     parser.add_argument("--small-test", action="store_true", help="Run small test on 4 matched CVs (A1, A2, A3, B1)")
+    parser.add_argument("--no-cache", action="store_true", help="Skip the on-disk pipeline result cache and force live LLM calls")
     
     args = parser.parse_args()
     
@@ -206,66 +301,33 @@ async def main():
     # Load CV data
     cv_data = load_cv_data(args.data)
     
-    # Small test mode - filter for 4 matched CVs (A1, A2, A3, B1)
-    if args.small_test:
-        # Load mapping to find sanitized IDs for A1, A2, A3, B1
+    # Test modes filter CVs down to a fixed set of original IDs; one block
+    # covers all three, with the mapping loaded and scanned once per mode
+    # flag instead of re-parsed in three near-identical branches
+    test_modes = [
+        (args.small_test, {'A1', 'A2', 'A3', 'B1'},
+         "small test mode (4 matched CVs"),
+        (args.quick_test, {'C1', 'C2', 'C3', 'D1', 'D2'},
+         "quick test mode (C and D CVs only"),
+        (args.extended_test, {'A1', 'A2', 'A3', 'B1', 'B2', 'C1', 'C2', 'C3', 'D1', 'D2'},
+         "extended test mode (A, B, C, and D CVs"),
+    ]
+    selected_modes = [(targets, label) for enabled, targets, label in test_modes if enabled]
+    if selected_modes:
         mapping_path = Path(__file__).parent / "data" / "cv_id_mapping.json"
-        with open(mapping_path, 'r', encoding='utf-8') as f:
-            mapping = json.load(f)
-        
-        # Find sanitized IDs for A1, A2, A3, B1 (4 matched CVs)
-        target_original_ids = ['A1', 'A2', 'A3', 'B1']
-        sanitized_ids = []
-        for sanitized_id, info in mapping.items():
-            if info['original_id'] in target_original_ids:
-                sanitized_ids.append(sanitized_id)
-        
-        # Filter CVs
-        cv_data = [cv for cv in cv_data if cv['id'] in sanitized_ids]
-        print(f"Running in small test mode (4 matched CVs: {len(cv_data)} CVs)")
-        print()
+        mapping = orjson.loads(mapping_path.read_bytes())
+        for target_original_ids, label in selected_modes:
+            sanitized_ids = {
+                sanitized_id for sanitized_id, info in mapping.items()
+                if info['original_id'] in target_original_ids
+            }
+            cv_data = [cv for cv in cv_data if cv['id'] in sanitized_ids]
+            print(f"Running in {label}: {len(cv_data)} CVs)")
+            print()
     
-    # Quick test mode - filter for C and D CVs
-    if args.quick_test:
-        # Load mapping to find sanitized IDs for C1, C2, C3, D1, D2
-        mapping_path = Path(__file__).parent / "data" / "cv_id_mapping.json"
-        with open(mapping_path, 'r', encoding='utf-8') as f:
-            mapping = json.load(f)
-        
-        # Find sanitized IDs for C1, C2, C3, D1, D2
-        target_original_ids = ['C1', 'C2', 'C3', 'D1', 'D2']
-        sanitized_ids = []
-        for sanitized_id, info in mapping.items():
-            if info['original_id'] in target_original_ids:
-                sanitized_ids.append(sanitized_id)
-        
-        # Filter CVs
-        cv_data = [cv for cv in cv_data if cv['id'] in sanitized_ids]
-        print(f"Running in quick test mode (C and D CVs only: {len(cv_data)} CVs)")
-        print()
-    
-    # Extended test mode - filter for A, B, C, and D CVs
-    if args.extended_test:
-        # Load mapping to find sanitized IDs for A1-A3, B1-B2, C1-C3, D1-D2
-        mapping_path = Path(__file__).parent / "data" / "cv_id_mapping.json"
-        with open(mapping_path, 'r', encoding='utf-8') as f:
-            mapping = json.load(f)
-        
-        # Find sanitized IDs for A1, A2, A3, B1, B2, C1, C2, C3, D1, D2
-        target_original_ids = ['A1', 'A2', 'A3', 'B1', 'B2', 'C1', 'C2', 'C3', 'D1', 'D2']
-        sanitized_ids = []
-        for sanitized_id, info in mapping.items():
-            if info['original_id'] in target_original_ids:
-                sanitized_ids.append(sanitized_id)
-        
-        # Filter CVs
-        cv_data = [cv for cv in cv_data if cv['id'] in sanitized_ids]
-        print(f"Running in extended test mode (A, B, C, and D CVs: {len(cv_data)} CVs)")
-        print()
-    
-    # Load job ad and criteria
-    job_ad = load_job_ad()
-    detailed_criteria = load_detailed_criteria()
+    # Load job ad and criteria off the event loop thread
+    job_ad = await load_job_ad_async()
+    detailed_criteria = await load_detailed_criteria_async()
     
     # Run experiment
     results = await run_experiment(
@@ -276,7 +338,8 @@ async def main():
         models=args.models,
         pipelines=args.pipelines,
         cv_ids=args.cv_ids,
-        providers=args.providers
+        providers=args.providers,
+        use_cache=not args.no_cache
     )
     
     if not results:
@@ -312,14 +375,42 @@ async def main():
     print("EXPERIMENT SUMMARY")
     print("="*60)
     
-    comparison_df = framework.create_comparison_dataframe(results)
-    
+    # Plain counters beat pandas here: this summary exists only to be
+    # printed, so there's no point paying for DataFrame construction
+    # (save_results already wrote the full table to comparison.csv)
+    label_counts = Counter()
+    token_totals = defaultdict(lambda: [0, 0])  # pipeline -> [token sum, row count]
+    for result in results:
+        total_tokens = _usage_tuple(result)[0]
+        n_rows = len(result.rankings)
+        stats = token_totals[result.pipeline_name]
+        stats[0] += total_tokens * n_rows
+        stats[1] += n_rows
+        for ranking in result.rankings:
+            label = _RANKING_LABELS.get(ranking.ranking, "Unknown")
+            label_counts[(result.pipeline_name, label)] += 1
+
+    pipeline_names = sorted(token_totals)
+    width = max(len(name) for name in pipeline_names)
+    # Columns in rating order (best fit first), skipping unused labels
+    seen_labels = {label for _, label in label_counts}
+    label_order = [
+        label for label in list(_RANKING_LABELS.values()) + ["Unknown"]
+        if label in seen_labels
+    ]
+
     print("\nRanking Distribution by Pipeline:")
-    print(comparison_df.groupby(['pipeline', 'ranking_label']).size().unstack(fill_value=0))
-    
+    print(f"{'pipeline':<{width}}  " + "  ".join(f"{label:>13}" for label in label_order))
+    for name in pipeline_names:
+        counts = "  ".join(f"{label_counts.get((name, label), 0):>13}" for label in label_order)
+        print(f"{name:<{width}}  {counts}")
+
     print("\nToken Usage by Pipeline:")
-    usage_summary = comparison_df.groupby('pipeline')['total_tokens'].agg(['mean', 'sum', 'count'])
-    print(usage_summary)
+    print(f"{'pipeline':<{width}}  {'mean':>12}  {'sum':>12}  {'count':>7}")
+    for name in pipeline_names:
+        token_sum, row_count = token_totals[name]
+        mean = token_sum / row_count if row_count else 0.0
+        print(f"{name:<{width}}  {mean:>12.1f}  {token_sum:>12}  {row_count:>7}")
     
     print(f"\nDetailed results saved to: {experiment_dir}")
     print(f"Comparison CSV: {experiment_dir / 'comparison.csv'}")
@@ -327,4 +418,12 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # uvloop's libuv-based loop dispatches the concurrent HTTPS calls with
+    # much less per-callback overhead than the default selector loop; it's
+    # a soft dependency (unavailable on Windows), so fall back silently
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
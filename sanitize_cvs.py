@@ -1,55 +1,68 @@
 #!/usr/bin/env python3
 """Sanitize CV data by randomizing IDs and order."""
-import json
-import random
 import string
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import numpy as np
+import orjson
 
-def generate_random_id(length=8):
-    """Generate a random alphanumeric ID."""
-    return ''.join(random.choices(string.ascii_uppercase + string.digits, k=length))
+_ALPHABET = np.frombuffer(
+    (string.ascii_uppercase + string.digits).encode('ascii'), dtype='S1'
+)
+
+
+def generate_random_ids(count: int, length: int = 8, rng=None) -> list:
+    """Generate random alphanumeric IDs in one vectorized batch."""
+    rng = rng if rng is not None else np.random.default_rng()
+    idx = rng.integers(0, len(_ALPHABET), size=(count, length))
+    return [s.decode('ascii') for s in _ALPHABET[idx].view(f'S{length}').ravel()]
 
 
 def sanitize_cvs(input_path: str, output_path: str, mapping_path: str):
     """Sanitize CVs by randomizing IDs and order."""
     # Load original CVs
-    with open(input_path, 'r') as f:
-        original_cvs = json.load(f)
-    
+    original_cvs = orjson.loads(Path(input_path).read_bytes())
+
+    # One RNG instance drives both the shuffle and the batched ID draw
+    rng = np.random.default_rng()
+
+    # Shuffle the order
+    shuffled_cvs = original_cvs.copy()
+    rng.shuffle(shuffled_cvs)
+
+    new_ids = generate_random_ids(len(shuffled_cvs), rng=rng)
+
     # Create mapping and sanitized CVs
     id_mapping = {}
     sanitized_cvs = []
-    
-    # Shuffle the order
-    shuffled_cvs = original_cvs.copy()
-    random.shuffle(shuffled_cvs)
-    
-    for cv in shuffled_cvs:
-        original_id = cv['id']
-        new_id = generate_random_id()
-        
+
+    for cv, new_id in zip(shuffled_cvs, new_ids):
         # Store mapping
         id_mapping[new_id] = {
-            "original_id": original_id,
+            "original_id": cv['id'],
             "original_name": cv.get('name', 'Unknown')
         }
-        
+
         # Create sanitized CV (only ID and content)
-        sanitized_cv = {
+        sanitized_cvs.append({
             "id": new_id,
             "content": cv['content']
-        }
-        sanitized_cvs.append(sanitized_cv)
-    
-    # Save sanitized CVs
-    with open(output_path, 'w') as f:
-        json.dump(sanitized_cvs, f, indent=2)
-    
-    # Save mapping
-    with open(mapping_path, 'w') as f:
-        json.dump(id_mapping, f, indent=2)
-    
+        })
+
+    # The two output files are independent - write them concurrently.
+    # The CVs file is machine-read on every run, so it stays compact;
+    # only the small mapping file is kept human-readable
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        executor.submit(
+            Path(output_path).write_bytes,
+            orjson.dumps(sanitized_cvs)
+        )
+        executor.submit(
+            Path(mapping_path).write_bytes,
+            orjson.dumps(id_mapping, option=orjson.OPT_INDENT_2)
+        )
+
     print(f"Sanitized {len(sanitized_cvs)} CVs")
     print(f"Sanitized CVs saved to: {output_path}")
     print(f"ID mapping saved to: {mapping_path}")
@@ -62,6 +75,5 @@ if __name__ == "__main__":
     input_path = "data/cvs_revised_v2.json"
     output_path = "data/cvs_sanitized.json"
     mapping_path = "data/cv_id_mapping.json"
-    
-    sanitize_cvs(input_path, output_path, mapping_path)
 
+    sanitize_cvs(input_path, output_path, mapping_path)
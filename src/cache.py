@@ -0,0 +1,118 @@
+"""Exact-match on-disk cache for LLM responses."""
+import asyncio
+import hashlib
+import os
+import time
+from pathlib import Path
+from typing import Dict
+
+import orjson
+
+from .providers.base import LLMProvider, LLMResponse
+
+# Keyed by model + prompt, so identical criteria queries (across CVs with
+# identical content, or across reruns) skip the API call entirely. Distinct
+# from the experiment-level .pipeline_cache, which only hits when the whole
+# (model, pipeline, input) combination is unchanged.
+CACHE_DIR = Path(os.environ.get("LLM_CACHE_DIR", ".cache/llm"))
+
+# Entries older than the TTL are treated as misses and rewritten
+CACHE_TTL_SECONDS = int(os.environ.get("LLM_CACHE_TTL", 7 * 24 * 3600))
+
+
+def _cache_path(model: str, temperature: float, max_tokens, prompt: str) -> Path:
+    # Bucket the numeric knobs: float noise (0.7000001 vs 0.7) and nearby
+    # output caps would otherwise fragment identical requests across keys.
+    # max_tokens rounds up to the next multiple of 128, which serves the
+    # same response for any cap in the bucket.
+    temperature = round(float(temperature), 2)
+    if max_tokens:
+        max_tokens = -(-int(max_tokens) // 128) * 128
+    key = hashlib.blake2b(
+        f"{model}\0{temperature}\0{max_tokens}\0{prompt}".encode(), digest_size=16
+    ).hexdigest()
+    return CACHE_DIR / f"{key}.json"
+
+
+# In-memory layer over the disk cache: repeat hits within a run skip the
+# stat + read + parse and return in microseconds
+_memory: Dict[Path, LLMResponse] = {}
+
+
+# Concurrent identical misses coalesce onto one API call: the first
+# caller creates the task, later callers await the same one
+_inflight: Dict[Path, "asyncio.Task[LLMResponse]"] = {}
+
+
+async def _generate_and_store(provider: LLMProvider, prompt: str,
+                              path: Path, kwargs: dict) -> LLMResponse:
+    response = await provider.generate(prompt, **kwargs)
+
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    # Write-then-rename keeps concurrent tasks racing on the same key from
+    # ever observing a half-written entry
+    tmp_path = path.with_name(f"{path.stem}.{os.getpid()}.tmp")
+    tmp_path.write_bytes(orjson.dumps(response.model_dump()))
+    tmp_path.replace(path)
+
+    _memory[path] = response
+    return response
+
+
+def invalidate(provider: LLMProvider, prompt: str, **kwargs) -> None:
+    """Drop the cached entry for this call, if any.
+
+    Lets callers evict a response that turned out to be unusable (e.g.
+    unparseable), so retries and later runs regenerate it instead of
+    replaying the same bad response for the full TTL.
+    """
+    path = _cache_path(
+        provider.model,
+        kwargs.get("temperature", provider.temperature),
+        kwargs.get("max_tokens", provider.max_tokens),
+        prompt,
+    )
+    _memory.pop(path, None)
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+async def cached_generate(provider: LLMProvider, prompt: str, **kwargs) -> LLMResponse:
+    """Call provider.generate(prompt), serving exact repeats from disk.
+
+    Extra kwargs (e.g. cached_prefix) are passed through to the provider;
+    they only shape how the request is sent, so the cache key stays the
+    full prompt text. Identical calls already in flight share one API
+    request instead of racing to the same cache miss.
+    """
+    path = _cache_path(
+        provider.model,
+        kwargs.get("temperature", provider.temperature),
+        kwargs.get("max_tokens", provider.max_tokens),
+        prompt,
+    )
+
+    cached = _memory.get(path)
+    if cached is not None:
+        return cached
+
+    try:
+        if time.time() - path.stat().st_mtime < CACHE_TTL_SECONDS:
+            # Entries were written from a validated response's model_dump,
+            # so construction can skip re-validation
+            response = LLMResponse.model_construct(**orjson.loads(path.read_bytes()))
+            _memory[path] = response
+            return response
+    except (FileNotFoundError, orjson.JSONDecodeError):
+        pass
+
+    task = _inflight.get(path)
+    if task is None:
+        task = asyncio.ensure_future(
+            _generate_and_store(provider, prompt, path, kwargs)
+        )
+        _inflight[path] = task
+        task.add_done_callback(lambda _: _inflight.pop(path, None))
+    return await task
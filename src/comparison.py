@@ -1,11 +1,38 @@
 """Comparison and evaluation framework for pipeline results."""
-import json
+import os
+import orjson
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Any
 from datetime import datetime
 from .pipelines.base import PipelineResult
 
+# Hoisted to module scope so label lookups don't rebuild the dict per call
+_RANKING_LABELS = {4: "Excellent Fit", 3: "Good Fit", 2: "Borderline", 1: "Not a Fit"}
+
+_COMPARISON_COLUMNS = (
+    "cv_id", "name", "pipeline", "provider", "model",
+    "ranking", "ranking_label", "reasoning",
+    "total_tokens", "prompt_tokens", "completion_tokens",
+)
+
+
+def _usage_tuple(result: PipelineResult) -> tuple:
+    """Extract (total, prompt, completion) token counts once per result.
+
+    The usage dict probing is identical everywhere it appears; doing it once
+    per result keeps the per-ranking loops down to indexed tuple reads.
+    """
+    usage = result.metadata.get("usage")
+    if not isinstance(usage, dict):
+        return (0, 0, 0)
+    return (
+        usage.get("total_tokens", 0),
+        usage.get("prompt_tokens", 0),
+        usage.get("completion_tokens", 0),
+    )
+
 
 class ComparisonFramework:
     """Framework for comparing pipeline results."""
@@ -28,130 +55,154 @@ class ComparisonFramework:
             print("Consider using a unique experiment name to avoid overwriting.\n")
         
         experiment_dir.mkdir(exist_ok=True)
-        
-        # Save individual pipeline results
+
+        summary = {
+            "experiment_timestamp": datetime.now().isoformat(),
+            "total_pipeline_runs": len(results),
+            "pipelines": {},
+            "providers": {},
+            "models": {},
+        }
+        comparison_rows = []
+
+        # One traversal of results covers the per-result files, the summary
+        # accumulators, and the comparison rows, instead of three separate
+        # passes over the same rankings sub-lists. The two files per result
+        # are independent of each other, so their writes go to a thread pool
+        # (the syscalls release the GIL) while this thread keeps accumulating
+        executor = ThreadPoolExecutor(max_workers=min(8, max(len(results), 1)))
+        write_futures = []
         for result in results:
-            filename = f"{result.pipeline_name}_{result.provider}_{result.model}.json"
-            filepath = experiment_dir / filename
-            
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(result.model_dump(), f, indent=2)
-            
-            # Save rankings file (names and rankings)
-            rankings_filename = f"{result.pipeline_name}_{result.provider}_{result.model}_rankings.txt"
-            rankings_filepath = experiment_dir / rankings_filename
-            self._save_rankings_file(result, rankings_filepath)
-        
-        # Save summary
-        summary = self._create_summary(results)
+            base_name = f"{result.pipeline_name}_{result.provider}_{result.model}"
+            write_futures.append(executor.submit(
+                self._write_result_files,
+                result,
+                experiment_dir / f"{base_name}.json",
+                experiment_dir / f"{base_name}_rankings.txt",
+            ))
+
+            total_tokens, prompt_tokens, completion_tokens = _usage_tuple(result)
+
+            pipeline = summary["pipelines"].setdefault(result.pipeline_name, {
+                "count": 0,
+                "models": set(),
+                "total_tokens": 0,
+                "cv_count": 0
+            })
+            pipeline["count"] += 1
+            pipeline["models"].add(result.model)
+            pipeline["cv_count"] = len(result.rankings)
+            pipeline["total_tokens"] += total_tokens
+
+            for ranking in result.rankings:
+                comparison_rows.append((
+                    ranking.cv_id,
+                    ranking.name,
+                    result.pipeline_name,
+                    result.provider,
+                    result.model,
+                    ranking.ranking,
+                    self._ranking_label(ranking.ranking),
+                    ranking.reasoning,
+                    total_tokens,
+                    prompt_tokens,
+                    completion_tokens,
+                ))
+
+        # Convert sets to sorted lists for JSON serialization (orjson does
+        # not serialize sets, and stable ordering keeps summaries diffable)
+        for pipeline in summary["pipelines"].values():
+            pipeline["models"] = sorted(pipeline["models"])
+
+        # Surface any write error before reporting success; the summary and
+        # CSV stay on this thread since they depend on the accumulated state
+        for future in write_futures:
+            future.result()
+        executor.shutdown()
+
         summary_path = experiment_dir / "summary.json"
-        with open(summary_path, 'w', encoding='utf-8') as f:
-            json.dump(summary, f, indent=2)
-        
-        # Save comparison table
-        comparison_df = self.create_comparison_dataframe(results)
+        summary_path.write_bytes(orjson.dumps(summary, option=orjson.OPT_INDENT_2))
+
+        comparison_df = pd.DataFrame.from_records(
+            comparison_rows, columns=list(_COMPARISON_COLUMNS)
+        )
         comparison_path = experiment_dir / "comparison.csv"
         comparison_df.to_csv(comparison_path, index=False)
-        
+
         print(f"Results saved to {experiment_dir}")
         return experiment_dir
     
+    def _write_result_files(self, result: PipelineResult, json_path: Path, rankings_path: Path):
+        """Write one result's JSON dump and rankings text file."""
+        # orjson serializes in one pass and emits bytes directly,
+        # skipping the indented-str intermediate stdlib json builds
+        json_path.write_bytes(orjson.dumps(result.model_dump(), option=orjson.OPT_INDENT_2))
+        self._save_rankings_file(result, rankings_path)
+
     def _save_rankings_file(self, result: PipelineResult, filepath: Path):
         """Save a human-readable rankings file with names and rankings."""
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(f"Pipeline: {result.pipeline_name}\n")
-            f.write(f"Provider: {result.provider}\n")
-            f.write(f"Model: {result.model}\n")
-            f.write("=" * 60 + "\n\n")
-            
-            # Sort by ranking (descending) then by name
-            sorted_rankings = sorted(
-                result.rankings,
-                key=lambda x: (-x.ranking, x.name)
+        # Assemble the file in memory and write once, instead of pushing
+        # each fragment through the text I/O layer separately
+        parts = [
+            f"Pipeline: {result.pipeline_name}\n",
+            f"Provider: {result.provider}\n",
+            f"Model: {result.model}\n",
+            "=" * 60 + "\n\n",
+        ]
+
+        # Sort by ranking (descending) then by name. Decorate-sort-undecorate
+        # pays the pydantic attribute access once per row instead of once per
+        # comparison through the key lambda
+        # (the index tiebreaker keeps full-key ties from comparing models)
+        decorated = [(-r.ranking, r.name, i, r) for i, r in enumerate(result.rankings)]
+        decorated.sort()
+
+        for _, _, _, ranking in decorated:
+            label = _RANKING_LABELS.get(ranking.ranking, "Unknown")
+            parts.append(
+                f"Ranking: {ranking.ranking} ({label})\n"
+                f"Name: {ranking.name}\n"
+                f"CV ID: {ranking.cv_id}\n"
+                f"Reasoning: {ranking.reasoning}\n"
+                + "-" * 60 + "\n\n"
             )
-            
-            for ranking in sorted_rankings:
-                f.write(f"Ranking: {ranking.ranking} ({self._ranking_label(ranking.ranking)})\n")
-                f.write(f"Name: {ranking.name}\n")
-                f.write(f"CV ID: {ranking.cv_id}\n")
-                f.write(f"Reasoning: {ranking.reasoning}\n")
-                f.write("-" * 60 + "\n\n")
+
+        filepath.write_text(''.join(parts), encoding='utf-8')
     
     def _ranking_label(self, ranking: int) -> str:
         """Convert ranking number to label."""
-        labels = {4: "Excellent Fit", 3: "Good Fit", 2: "Borderline", 1: "Not a Fit"}
-        return labels.get(ranking, "Unknown")
-    
-    def _create_summary(self, results: List[PipelineResult]) -> Dict[str, Any]:
-        """Create a summary of results."""
-        summary = {
-            "experiment_timestamp": datetime.now().isoformat(),
-            "total_pipeline_runs": len(results),
-            "pipelines": {},
-            "providers": {},
-            "models": {},
-        }
-        
-        # Group by pipeline
-        for result in results:
-            pipeline_key = result.pipeline_name
-            if pipeline_key not in summary["pipelines"]:
-                summary["pipelines"][pipeline_key] = {
-                    "count": 0,
-                    "models": set(),
-                    "total_tokens": 0,
-                    "cv_count": 0
-                }
-            summary["pipelines"][pipeline_key]["count"] += 1
-            summary["pipelines"][pipeline_key]["models"].add(result.model)
-            summary["pipelines"][pipeline_key]["cv_count"] = len(result.rankings)
-            
-            # Get token usage
-            usage = result.metadata.get("usage", {})
-            if isinstance(usage, dict):
-                summary["pipelines"][pipeline_key]["total_tokens"] += usage.get("total_tokens", 0)
-        
-        # Convert sets to lists for JSON serialization
-        for pipeline in summary["pipelines"].values():
-            pipeline["models"] = list(pipeline["models"])
-        
-        return summary
+        return _RANKING_LABELS.get(ranking, "Unknown")
     
     def create_comparison_dataframe(self, results: List[PipelineResult]) -> pd.DataFrame:
         """Create a pandas DataFrame for easy comparison."""
-        rows = []
-        for result in results:
-            for ranking in result.rankings:
-                row = {
-                    "cv_id": ranking.cv_id,
-                    "name": ranking.name,
-                    "pipeline": result.pipeline_name,
-                    "provider": result.provider,
-                    "model": result.model,
-                    "ranking": ranking.ranking,
-                    "ranking_label": self._ranking_label(ranking.ranking),
-                    "reasoning": ranking.reasoning,
-                }
-                
-                # Add token usage (same for all CVs in this pipeline run)
-                usage = result.metadata.get("usage", {})
-                if isinstance(usage, dict):
-                    row["total_tokens"] = usage.get("total_tokens", 0)
-                    row["prompt_tokens"] = usage.get("prompt_tokens", 0)
-                    row["completion_tokens"] = usage.get("completion_tokens", 0)
-                else:
-                    row["total_tokens"] = 0
-                    row["prompt_tokens"] = 0
-                    row["completion_tokens"] = 0
-                
-                rows.append(row)
-        
-        return pd.DataFrame(rows)
+        def iter_rows():
+            for result in results:
+                # Token usage is the same for all CVs in this pipeline run,
+                # so extract it once per result instead of once per ranking
+                total_tokens, prompt_tokens, completion_tokens = _usage_tuple(result)
+
+                for ranking in result.rankings:
+                    yield (
+                        ranking.cv_id,
+                        ranking.name,
+                        result.pipeline_name,
+                        result.provider,
+                        result.model,
+                        ranking.ranking,
+                        self._ranking_label(ranking.ranking),
+                        ranking.reasoning,
+                        total_tokens,
+                        prompt_tokens,
+                        completion_tokens,
+                    )
+
+        return pd.DataFrame.from_records(iter_rows(), columns=list(_COMPARISON_COLUMNS))
     
     def compare_pipelines(self, results: List[PipelineResult], cv_id: str = None) -> pd.DataFrame:
         """Compare results across pipelines for a specific CV or all CVs."""
         comparison_data = []
         for result in results:
+            total_tokens = _usage_tuple(result)[0]
             for ranking in result.rankings:
                 if cv_id is None or ranking.cv_id == cv_id:
                     comparison_data.append({
@@ -162,7 +213,7 @@ class ComparisonFramework:
                         "ranking": ranking.ranking,
                         "ranking_label": self._ranking_label(ranking.ranking),
                         "reasoning": ranking.reasoning,
-                        "tokens_used": result.metadata.get("usage", {}).get("total_tokens", 0) if isinstance(result.metadata.get("usage"), dict) else 0
+                        "tokens_used": total_tokens
                     })
         
         return pd.DataFrame(comparison_data)
@@ -172,14 +223,13 @@ class ComparisonFramework:
         experiment_dir = self.results_dir / experiment_name
         if not experiment_dir.exists():
             raise ValueError(f"Experiment {experiment_name} not found")
-        
-        results = []
-        for filepath in experiment_dir.glob("*.json"):
-            if filepath.name == "summary.json":
-                continue
-            
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                results.append(PipelineResult(**data))
-        
-        return results
+
+        # scandir skips glob's per-entry stat calls; the reads overlap in a
+        # thread pool (file I/O releases the GIL) and orjson does the parse
+        entries = [
+            entry for entry in os.scandir(experiment_dir)
+            if entry.name.endswith('.json') and entry.name != 'summary.json'
+        ]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            datas = executor.map(lambda entry: orjson.loads(Path(entry.path).read_bytes()), entries)
+            return [PipelineResult(**data) for data in datas]
@@ -1,41 +1,47 @@
 """Load job ad and criteria data."""
-import json
+import asyncio
+from functools import lru_cache
 from pathlib import Path
 
+import orjson
+
+
+@lru_cache(maxsize=1)
+def _load_job_ad_data() -> dict:
+    """Read and parse data/jobAd.json once.
+
+    The job ad and criteria used to live as string constants in a Python
+    file that was exec'd on every load; parsing a small JSON blob is far
+    cheaper than compile+exec and doesn't run arbitrary code. Both public
+    loaders pull from the same cached parse.
+    """
+    job_ad_path = Path(__file__).parent.parent / "data" / "jobAd.json"
+    return orjson.loads(job_ad_path.read_bytes())
+
 
 def load_job_ad() -> str:
-    """Load job ad from Python file."""
-    job_ad_path = Path(__file__).parent.parent / "data" / "jobAd.py"
-    
-    # Read and execute the Python file to get the variables
-    job_ad = None
-    with open(job_ad_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-        # Create a local namespace to execute the file
-        namespace = {}
-        exec(content, namespace)
-        job_ad = namespace.get('job_ad', '')
-    
+    """Load job ad text."""
+    job_ad = _load_job_ad_data().get('job_ad', '')
     return job_ad.strip() if job_ad else ''
 
 
 def load_detailed_criteria() -> str:
     """Load detailed hiring criteria."""
-    job_ad_path = Path(__file__).parent.parent / "data" / "jobAd.py"
-    
-    detailed_hiring_criteria = None
-    with open(job_ad_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-        namespace = {}
-        exec(content, namespace)
-        detailed_hiring_criteria = namespace.get('detailed_hiring_criteria', '')
-    
+    detailed_hiring_criteria = _load_job_ad_data().get('detailed_hiring_criteria', '')
     return detailed_hiring_criteria.strip() if detailed_hiring_criteria else ''
 
 
+async def load_job_ad_async() -> str:
+    """load_job_ad without blocking the event loop on the first (disk) call."""
+    return await asyncio.to_thread(load_job_ad)
+
+
+async def load_detailed_criteria_async() -> str:
+    """load_detailed_criteria without blocking the event loop on the first call."""
+    return await asyncio.to_thread(load_detailed_criteria)
+
+
 def load_category_guidance() -> list:
     """Load category guidance from JSON."""
     guidance_path = Path(__file__).parent.parent / "data" / "category_guidance.json"
-    with open(guidance_path, 'r') as f:
-        return json.load(f)
-
+    return orjson.loads(guidance_path.read_bytes())
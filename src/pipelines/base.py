@@ -1,8 +1,106 @@
 """Base class for analysis pipelines."""
+import asyncio
+import os
+import random
+import re
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Union
+
+import orjson
 from pydantic import BaseModel
 from ..providers.base import LLMProvider
+from ..cache import cached_generate
+
+# Exact token counts when tiktoken is available; otherwise the standard
+# ~4-chars-per-token heuristic keeps the budget check dependency-free.
+# Broad except: tiktoken fetches encoder data over the network on first
+# use, so an installed-but-offline tiktoken must also fall back.
+try:
+    import tiktoken
+    _ENC = tiktoken.get_encoding("cl100k_base")
+except Exception:
+    _ENC = None
+
+# Compiled once at import: every pipeline strips the same ```json fences
+# from every response, and the fallback scan for a bare ranking is shared too
+_JSON_FENCE = re.compile(r"```(?:json)?\s*(\{.*?\}|\[.*?\])\s*```", re.DOTALL)
+_RANKING_RE = re.compile(r'"ranking"\s*:\s*(\d+)')
+
+
+def _first_json_object(text: str) -> Optional[Any]:
+    """Find and parse the first balanced {...} object embedded in text."""
+    start = text.find('{')
+    while start != -1:
+        depth = 0
+        in_str = False
+        escaped = False
+        for i in range(start, len(text)):
+            ch = text[i]
+            if in_str:
+                if escaped:
+                    escaped = False
+                elif ch == '\\':
+                    escaped = True
+                elif ch == '"':
+                    in_str = False
+            elif ch == '"':
+                in_str = True
+            elif ch == '{':
+                depth += 1
+            elif ch == '}':
+                depth -= 1
+                if depth == 0:
+                    try:
+                        return orjson.loads(text[start:i + 1])
+                    except orjson.JSONDecodeError:
+                        break
+        start = text.find('{', start + 1)
+    return None
+
+
+def extract_json_from_response(content: str) -> Any:
+    """Parse JSON from an LLM response, unwrapping a code fence if present.
+
+    When the response wraps the JSON in prose rather than a fence, the
+    first balanced {...} object is extracted instead of giving up.
+    Raises orjson.JSONDecodeError (a json.JSONDecodeError subclass, so
+    existing except clauses keep working) when no JSON can be parsed.
+    """
+    match = _JSON_FENCE.search(content)
+    try:
+        return orjson.loads(match.group(1) if match else content.strip())
+    except orjson.JSONDecodeError:
+        parsed = _first_json_object(content)
+        if parsed is not None:
+            return parsed
+        raise
+
+
+@lru_cache(maxsize=16)
+def extract_criteria_section(detailed_criteria: str, criteria_name: str) -> str:
+    """Extract the section for one criterion from the detailed criteria text.
+
+    The criteria text is a process-lifetime constant and there are only a
+    handful of criteria names, so the scan is memoized - each (text, name)
+    pair is resolved once and every later call is a cache hit.
+    """
+    lines = detailed_criteria.splitlines()
+    name_lower = criteria_name.lower()
+    start_idx = None
+
+    for i, line in enumerate(lines):
+        line_lower = line.lower()
+        if start_idx is None:
+            if name_lower in line_lower and '#' in line:
+                start_idx = i
+        elif line.lstrip().startswith('#') and name_lower not in line_lower:
+            return '\n'.join(lines[start_idx:i])
+
+    if start_idx is not None:
+        return '\n'.join(lines[start_idx:])
+
+    return detailed_criteria  # Fallback to full criteria
 
 
 class RankingResult(BaseModel):
@@ -13,6 +111,73 @@ class RankingResult(BaseModel):
     reasoning: str = ""
 
 
+# CVs that cannot plausibly be a fit (empty, truncated, or missing every
+# required keyword) are rejected locally, skipping all LLM calls for them.
+# Keywords default to none so the length check alone applies unless the
+# experiment opts in via LLM_PREFILTER_KEYWORDS (comma-separated).
+_PREFILTER_MIN_CHARS = int(os.environ.get("LLM_PREFILTER_MIN_CHARS", 200))
+_PREFILTER_KEYWORDS = tuple(
+    kw.strip().lower()
+    for kw in os.environ.get("LLM_PREFILTER_KEYWORDS", "").split(",")
+    if kw.strip()
+)
+
+
+# An over-budget CV can push a prompt past the model's context window and
+# fail late in a run; truncating up front bounds worst-case cost per CV
+_MAX_CV_TOKENS = int(os.environ.get("LLM_MAX_CV_TOKENS", 8000))
+
+
+def fit_cv_content(content: str, max_tokens: int = _MAX_CV_TOKENS) -> str:
+    """Truncate an over-budget CV from the middle, keeping head and tail.
+
+    The head carries the name and summary, the tail the most recent
+    detail sections; the middle is the cheapest part to lose.
+    """
+    if _ENC is not None:
+        tokens = _ENC.encode(content)
+        if len(tokens) <= max_tokens:
+            return content
+        keep = max_tokens // 2
+        head = _ENC.decode(tokens[:keep])
+        tail = _ENC.decode(tokens[-(max_tokens - keep):])
+    else:
+        max_chars = max_tokens * 4
+        if len(content) <= max_chars:
+            return content
+        keep = max_chars // 2
+        head = content[:keep]
+        tail = content[-(max_chars - keep):]
+    return f"{head}\n\n[... truncated for length ...]\n\n{tail}"
+
+
+def candidate_block(cv: Dict[str, Any]) -> str:
+    """Per-CV prompt tail appended after a shared, cacheable prefix."""
+    return f"\n\n===CANDIDATE===\nCV ID: {cv['id']}\n{fit_cv_content(cv['content'])}"
+
+
+def prefilter_cv(cv: Dict[str, Any]) -> Optional[RankingResult]:
+    """Return a ranking=1 result for a CV that needs no model call, else None."""
+    content = cv.get("content") or ""
+    if len(content) >= _PREFILTER_MIN_CHARS and (
+        not _PREFILTER_KEYWORDS
+        or any(kw in content.lower() for kw in _PREFILTER_KEYWORDS)
+    ):
+        return None
+
+    name = "Unknown"
+    if content:
+        first_line = content.split('\n')[0].strip()
+        name = first_line.replace('#', '').replace('_', '').strip() or "Unknown"
+
+    return RankingResult(
+        cv_id=cv['id'],
+        name=name,
+        ranking=1,
+        reasoning="Pre-filter: insufficient content for evaluation"
+    )
+
+
 class PipelineResult(BaseModel):
     """Result from a pipeline execution."""
     pipeline_name: str
@@ -25,11 +190,61 @@ class PipelineResult(BaseModel):
 
 class Pipeline(ABC):
     """Abstract base class for CV analysis pipelines."""
-    
-    def __init__(self, llm_provider: LLMProvider, name: str):
-        self.llm_provider = llm_provider
+
+    # Pipelines that can evaluate many CVs in one LLM call (amortizing
+    # per-request overhead) set this and implement analyze_batch
+    supports_batch = False
+
+    def __init__(self, llm_provider: Union[LLMProvider, Dict[str, LLMProvider]],
+                 name: str, max_concurrency: int = 16):
+        # llm_provider is either a single provider used for every call, or a
+        # {"fast": ..., "strong": ...} dict that routes cheap per-criterion
+        # calls to a smaller model while synthesis keeps the flagship.
+        # self.llm_provider stays the strong provider so result metadata and
+        # existing call sites are unchanged.
+        if isinstance(llm_provider, dict):
+            self.providers = dict(llm_provider)
+            self.llm_provider = self.providers["strong"]
+            self.providers.setdefault("fast", self.llm_provider)
+        else:
+            self.providers = {"fast": llm_provider, "strong": llm_provider}
+            self.llm_provider = llm_provider
         self.name = name
-    
+        # Every pipeline fans out over the CV list; an uncapped gather floods
+        # the provider into 429 backoff and ends up slower than a bounded
+        # fan-out. Overridable via LLM_MAX_CONCURRENCY.
+        env_cap = os.environ.get("LLM_MAX_CONCURRENCY")
+        if env_cap:
+            max_concurrency = int(env_cap)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _generate(self, prompt: str, cache: bool = True, tier: str = "strong",
+                        max_retries: int = 3, **kwargs):
+        """Call the tier's provider with the concurrency cap applied.
+
+        Exact repeats are served from the on-disk response cache; pass
+        cache=False for calls that must hit the API every time, and
+        tier="fast" for calls a smaller model can handle. Transient
+        provider errors (429s, timeouts, 5xx) are retried with jittered
+        exponential backoff instead of aborting the whole gather.
+        """
+        provider = self.providers[tier]
+        for attempt in range(max_retries + 1):
+            if attempt:
+                # Backoff sleeps happen outside the semaphore so a waiting
+                # retry never holds a concurrency slot; the jitter keeps
+                # retries from re-aligning into a synchronized burst
+                await asyncio.sleep(min(2 ** (attempt - 1), 30) + random.uniform(0, 0.5))
+            try:
+                async with self._semaphore:
+                    if cache:
+                        return await cached_generate(provider, prompt, **kwargs)
+                    return await provider.generate(prompt, **kwargs)
+            except Exception:
+                if attempt == max_retries:
+                    raise
+
+
     @abstractmethod
     async def analyze(self, cv_list: List[Dict[str, Any]], job_ad: str, detailed_criteria: str) -> PipelineResult:
         """Analyze a list of CVs and return rankings.
@@ -1,28 +1,14 @@
 """Chain-of-thought pipeline - step-by-step reasoning."""
 import json
 import asyncio
+import hashlib
 from typing import Dict, Any, List
-from .base import Pipeline, PipelineResult, RankingResult
+from .base import Pipeline, PipelineResult, RankingResult, candidate_block, extract_json_from_response, prefilter_cv, _RANKING_RE
 
-
-class ChainOfThoughtPipeline(Pipeline):
-    """Chain-of-thought reasoning pipeline with explicit steps."""
-    
-    def __init__(self, llm_provider):
-        super().__init__(llm_provider, "chain_of_thought")
-    
-    async def _analyze_single_cv(self, cv: Dict[str, Any], job_ad: str, detailed_criteria: str) -> RankingResult:
-        """Analyze a single CV independently with chain-of-thought."""
-        prompt = f"""You are a recruiter evaluating a candidate for a Founding Operator role.  
-
-Job Description:
-{job_ad}
-
-Detailed Hiring Criteria:
-{detailed_criteria}
-
-Candidate CV:
-{cv['content']}
+# The step instructions and output schema sit in the shared prefix, before
+# the candidate marker, so the prompt prefix is bytewise identical across
+# CVs and providers can reuse their KV cache for it
+_PROMPT_INSTRUCTIONS = """
 
 Follow this step-by-step process:
 
@@ -45,14 +31,32 @@ Step 4: Synthesize overall fit
 - Consider all three criteria together
 - Determine overall rating: 4 (Excellent), 3 (Good), 2 (Borderline), 1 (Not a Fit)
 
-After completing your step-by-step analysis, provide your final ranking in JSON format:
-{{
-    "cv_id": "{cv['id']}",
+After completing your step-by-step analysis, provide your final ranking in JSON format, using the candidate's CV ID:
+{
+    "cv_id": "<cv_id>",
     "ranking": 4
-}}"""
+}"""
+
+
+class ChainOfThoughtPipeline(Pipeline):
+    """Chain-of-thought reasoning pipeline with explicit steps."""
+
+    def __init__(self, llm_provider, max_concurrency: int = 16, batch_size: int = 1):
+        super().__init__(llm_provider, "chain_of_thought", max_concurrency)
+        # batch_size > 1 packs several CVs into one request, amortizing the
+        # shared prefix and per-request overhead. Default stays 1 because
+        # independent per-CV calls are this pipeline's point of comparison.
+        self.batch_size = batch_size
+
+    async def _analyze_single_cv(self, cv: Dict[str, Any], prompt_prefix: str) -> RankingResult:
+        """Analyze a single CV independently with chain-of-thought."""
+        # Only the tail varies per CV; everything before the marker is the
+        # exact same byte sequence for every call
+        prompt = prompt_prefix + candidate_block(cv)
+
+        # Transient provider errors are retried with backoff inside _generate
+        response = await self._generate(prompt, cached_prefix=prompt_prefix)
 
-        response = await self.llm_provider.generate(prompt)
-        
         # Extract name from CV content
         cv_content = cv.get("content", "")
         name = "Unknown"
@@ -65,14 +69,8 @@ After completing your step-by-step analysis, provide your final ranking in JSON
         reasoning = ""
         step_analysis = {}
         try:
-            content = response.content.strip()
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0].strip()
-            elif "```" in content:
-                content = content.split("```")[1].split("```")[0].strip()
-            
-            parsed = json.loads(content)
-            
+            parsed = extract_json_from_response(response.content)
+
             # Handle different response structures
             if isinstance(parsed, dict):
                 ranking_value = parsed.get("ranking", 0)
@@ -102,8 +100,7 @@ After completing your step-by-step analysis, provide your final ranking in JSON
                 
         except (json.JSONDecodeError, KeyError, ValueError):
             # Fallback: try to extract ranking from text
-            import re
-            ranking_match = re.search(r'"ranking"\s*:\s*(\d+)', response.content)
+            ranking_match = _RANKING_RE.search(response.content)
             if ranking_match:
                 ranking = int(ranking_match.group(1))
             else:
@@ -118,24 +115,125 @@ After completing your step-by-step analysis, provide your final ranking in JSON
             reasoning=reasoning
         )
         return ranking_result, step_analysis
-    
+
+    async def _analyze_cv_batch(self, cvs: List[Dict[str, Any]], prompt_prefix: str) -> List[tuple]:
+        """Evaluate a group of CVs in one request, expecting a JSON array back."""
+        blocks = ''.join(candidate_block(cv) for cv in cvs)
+        prompt = (
+            prompt_prefix
+            + "\n\nSeveral candidates follow. Apply the step-by-step process to each "
+              "candidate independently and return a JSON array with one object per "
+              'candidate: [{"cv_id": "<cv_id>", "ranking": 4}, ...]'
+            + blocks
+        )
+
+        response = await self._generate(prompt, cached_prefix=prompt_prefix)
+
+        rankings_by_id = {}
+        try:
+            parsed = extract_json_from_response(response.content)
+            if isinstance(parsed, list):
+                rankings_by_id = {
+                    item.get("cv_id"): item for item in parsed if isinstance(item, dict)
+                }
+        except (json.JSONDecodeError, KeyError, ValueError):
+            pass
+
+        results = []
+        missing = []
+        for cv in cvs:
+            item = rankings_by_id.get(cv['id'])
+            if item is None or not isinstance(item.get("ranking"), int):
+                missing.append(cv)
+                continue
+
+            cv_content = cv.get("content", "")
+            name = "Unknown"
+            if cv_content:
+                first_line = cv_content.split('\n')[0].strip()
+                name = first_line.replace('#', '').replace('_', '').strip()
+
+            results.append((RankingResult(
+                cv_id=cv['id'],
+                name=name,
+                ranking=item["ranking"],
+                reasoning=item.get("reasoning", "")
+            ), item.get("step_by_step_analysis", {})))
+
+        # Any CV the batched response failed to cover falls back to the
+        # per-CV path rather than failing the whole group
+        if missing:
+            results.extend(await asyncio.gather(
+                *(self._analyze_single_cv(cv, prompt_prefix) for cv in missing)
+            ))
+        return results
+
     async def analyze(self, cv_list: List[Dict[str, Any]], job_ad: str, detailed_criteria: str) -> PipelineResult:
         """Perform chain-of-thought analysis - one API call per CV."""
-        
-        # Process each CV independently in parallel
-        tasks = [self._analyze_single_cv(cv, job_ad, detailed_criteria) for cv in cv_list]
-        results = await asyncio.gather(*tasks)
-        
+
+        # The job ad, criteria, and instructions are identical for every CV;
+        # format the shared prompt prefix once per analyze() call
+        prompt_prefix = f"""You are a recruiter evaluating a candidate for a Founding Operator role.
+
+Job Description:
+{job_ad}
+
+Detailed Hiring Criteria:
+{detailed_criteria}""" + _PROMPT_INSTRUCTIONS
+
+        # Deterministic pre-filter: obviously-not-a-fit CVs get ranking=1
+        # locally, so they never cost an API call
+        prefiltered = []
+        remaining = []
+        for cv in cv_list:
+            short_circuit = prefilter_cv(cv)
+            if short_circuit is not None:
+                prefiltered.append((short_circuit, {}))
+            else:
+                remaining.append(cv)
+
+        # Identical CV contents (common when re-running with duplicated
+        # inputs) are evaluated once; the result is fanned back out to
+        # every original cv_id afterwards
+        groups: Dict[bytes, List[Dict[str, Any]]] = {}
+        for cv in remaining:
+            h = hashlib.blake2b(cv['content'].encode(), digest_size=16).digest()
+            groups.setdefault(h, []).append(cv)
+        duplicates = {cvs[0]['id']: cvs[1:] for cvs in groups.values() if len(cvs) > 1}
+        remaining = [cvs[0] for cvs in groups.values()]
+
+        if self.batch_size > 1:
+            # Grouped mode: K CVs per request, gathered concurrently
+            groups = [
+                remaining[i:i + self.batch_size]
+                for i in range(0, len(remaining), self.batch_size)
+            ]
+            group_results = await asyncio.gather(
+                *(self._analyze_cv_batch(group, prompt_prefix) for group in groups)
+            )
+            results = [pair for group in group_results for pair in group]
+            note = f"CVs evaluated in batched API calls ({self.batch_size} per request)"
+        else:
+            # Process each CV independently in parallel
+            tasks = [self._analyze_single_cv(cv, prompt_prefix) for cv in remaining]
+            results = await asyncio.gather(*tasks)
+            note = "Each CV evaluated independently in separate API calls"
+
         # Separate rankings and analysis
         rankings = []
         all_analysis = {}
-        for ranking_result, step_analysis in results:
+        for ranking_result, step_analysis in prefiltered + list(results):
             rankings.append(ranking_result)
             all_analysis[ranking_result.cv_id] = step_analysis
-        
+            for dup_cv in duplicates.get(ranking_result.cv_id, ()):
+                rankings.append(ranking_result.model_copy(update={"cv_id": dup_cv['id']}))
+                all_analysis[dup_cv['id']] = step_analysis
+
         analysis = {
-            "note": "Each CV evaluated independently in separate API calls",
+            "note": note,
             "total_cvs": len(cv_list),
+            "prefiltered_cvs": len(prefiltered),
+            "deduplicated_cvs": sum(len(dups) for dups in duplicates.values()),
             "step_by_step_analyses": all_analysis
         }
         
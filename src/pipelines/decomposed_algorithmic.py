@@ -1,20 +1,57 @@
 """Decomposed pipeline with algorithmic aggregation - shares criteria evaluation with multi_layer."""
-import json
 import asyncio
+import hashlib
 from typing import Dict, Any, List
-from .base import Pipeline, PipelineResult, RankingResult
+from .base import Pipeline, PipelineResult, RankingResult, candidate_block, extract_json_from_response, extract_criteria_section, prefilter_cv
+from ..cache import invalidate
+
+# Rating instructions live in the shared prefix, before the candidate
+# marker, so each criterion's prompt prefix is bytewise identical across
+# CVs and providers can reuse their KV cache for it
+_RATING_INSTRUCTIONS = """
+
+Evaluate their fit to this specific criteria and rate as: Excellent, Good, Weak, or Not a Fit.
+
+Provide your evaluation in JSON format, using the candidate's CV ID:
+{
+    "cv_id": "<cv_id>",
+    "rating": "Excellent/Good/Weak/Not a Fit"
+}"""
+
+
+# Exact-match table for the well-formed ratings the prompt asks for; the
+# substring ladder below only runs for verbose or decorated responses
+_RATING_SCORES = {
+    'excellent': 4,
+    'good': 3,
+    'weak': 2,
+    'borderline': 2,
+    'not a fit': 1,
+    'not fit': 1,
+}
 
 
 class DecomposedAlgorithmicPipeline(Pipeline):
     """Evaluates criteria separately (like multi_layer) but uses algorithmic aggregation instead of LLM synthesis."""
 
-    def __init__(self, llm_provider, blind_mode: bool = False):
-        super().__init__(llm_provider, "decomposed_algorithmic", blind_mode)
+    _CRITERIA_LIST = [
+        ("Zero-to-One Operator", "zero_to_one"),
+        ("Technical T-Shape", "technical_t_shape"),
+        ("Recruitment Mastery", "recruitment_mastery")
+    ]
+
+    def __init__(self, llm_provider, blind_mode: bool = False, max_concurrency: int = 16):
+        super().__init__(llm_provider, "decomposed_algorithmic", max_concurrency)
+        self.blind_mode = blind_mode
 
     def _map_rating_to_score(self, rating: str) -> int:
         """Map qualitative rating to numeric score."""
         rating_lower = rating.lower().strip()
 
+        score = _RATING_SCORES.get(rating_lower)
+        if score is not None:
+            return score
+
         if 'excellent' in rating_lower:
             return 4
         elif 'good' in rating_lower:
@@ -33,7 +70,7 @@ class DecomposedAlgorithmicPipeline(Pipeline):
         scores = []
         reasoning_parts = []
 
-        for criteria_key in ['zero_to_one', 'technical_t_shape', 'recruitment_mastery']:
+        for _, criteria_key in self._CRITERIA_LIST:
             eval_data = criteria_evaluations.get(criteria_key, {})
 
             if isinstance(eval_data, dict):
@@ -63,48 +100,12 @@ class DecomposedAlgorithmicPipeline(Pipeline):
 
         return final_ranking, reasoning
 
-    def _extract_criteria_section(self, detailed_criteria: str, criteria_name: str) -> str:
-        """Extract the relevant section from detailed criteria."""
-        lines = detailed_criteria.split('\n')
-        start_idx = None
-        end_idx = None
-
-        for i, line in enumerate(lines):
-            if criteria_name.lower() in line.lower() and '#' in line:
-                start_idx = i
-            elif start_idx is not None and line.strip().startswith('#') and criteria_name.lower() not in line.lower():
-                end_idx = i
-                break
-
-        if start_idx is not None:
-            if end_idx is None:
-                end_idx = len(lines)
-            return '\n'.join(lines[start_idx:end_idx])
-
-        return detailed_criteria  # Fallback to full criteria
-
-    async def _evaluate_single_criteria(self, cv: Dict[str, Any], job_ad: str,
-                                         criteria_name: str, criteria_key: str,
-                                         criteria_section: str, max_retries: int = 2) -> Dict[str, Any]:
+    async def _evaluate_single_criteria(self, cv: Dict[str, Any], prompt_prefix: str,
+                                         max_retries: int = 2) -> Dict[str, Any]:
         """Evaluate a single criterion with retry logic."""
-        prompt = f"""You are a recruiter. Evaluate this candidate against the "{criteria_name}" criteria.
-
-Job Description:
-{job_ad}
-
-Criteria Details:
-{criteria_section}
-
-Candidate CV:
-{cv['content']}
-
-Evaluate their fit to this specific criteria and rate as: Excellent, Good, Weak, or Not a Fit.
-
-Provide your evaluation in JSON format:
-{{
-    "cv_id": "{cv['id']}",
-    "rating": "Excellent/Good/Weak/Not a Fit",
-}}"""
+        # Only the tail varies per CV; everything before the marker is the
+        # exact same byte sequence for every call on this criterion
+        prompt = prompt_prefix + candidate_block(cv)
 
         attempts = 0
         response = None
@@ -112,10 +113,14 @@ Provide your evaluation in JSON format:
             if attempts > 0:
                 await asyncio.sleep(0.5)
 
-            response = await self.llm_provider.generate(prompt)
+            # The schema is a tiny JSON blob; capping output tokens bounds
+            # the sequential decode time for each of the 3N criteria calls
+            response = await self._generate(
+                prompt, tier="fast", cached_prefix=prompt_prefix, max_tokens=128
+            )
 
             try:
-                parsed = self.extract_json_from_response(response.content)
+                parsed = extract_json_from_response(response.content)
                 if parsed and "rating" in parsed:
                     return {
                         "cv_id": cv['id'],
@@ -125,6 +130,11 @@ Provide your evaluation in JSON format:
             except Exception:
                 pass
 
+            # The response cache would replay this same unparseable
+            # response to every retry (and to later runs, for the full
+            # TTL); evict it so the retry regenerates - and the good
+            # retry response is what ends up cached
+            invalidate(self.providers["fast"], prompt, max_tokens=128)
             attempts += 1
 
         # Return error result after all retries
@@ -135,63 +145,94 @@ Provide your evaluation in JSON format:
             "rating": "Unknown"
         }
 
-    async def _analyze_single_cv(self, cv: Dict[str, Any], job_ad: str, detailed_criteria: str, max_retries: int = 2) -> tuple:
-        """Analyze a single CV with decomposed criteria evaluation and algorithmic aggregation."""
-        # Apply blind mode if enabled
-        cv = self.prepare_cv(cv)
-
-        # Layer 1: Evaluate each criteria separately in PARALLEL
-        criteria_list = [
-            ("Zero-to-One Operator", "zero_to_one"),
-            ("Technical T-Shape", "technical_t_shape"),
-            ("Recruitment Mastery", "recruitment_mastery")
-        ]
-
-        # Create tasks for parallel criteria evaluation
-        criteria_tasks = []
-        for criteria_name, criteria_key in criteria_list:
-            criteria_section = self._extract_criteria_section(detailed_criteria, criteria_name)
-            task = self._evaluate_single_criteria(cv, job_ad, criteria_name, criteria_key, criteria_section, max_retries)
-            criteria_tasks.append((criteria_key, task))
-
-        # Run all criteria evaluations in parallel
-        results = await asyncio.gather(*[task for _, task in criteria_tasks])
-        criteria_evaluations = {criteria_tasks[i][0]: results[i] for i in range(len(results))}
-
-        # Layer 2: Algorithmic aggregation (no API call)
-        final_ranking, reasoning = self._aggregate_scores(criteria_evaluations)
-
-        # Extract name from CV content
-        name = self.extract_name_from_cv(cv.get("content", ""))
-        if self.blind_mode:
-            name = "[BLIND]"
-
-        ranking_result = RankingResult(
-            cv_id=cv['id'],
-            name=name,
-            ranking=final_ranking,
-            reasoning=reasoning
-        )
-
-        return ranking_result, criteria_evaluations
-
     async def analyze(self, cv_list: List[Dict[str, Any]], job_ad: str, detailed_criteria: str) -> PipelineResult:
         """Perform decomposed analysis with algorithmic aggregation - CVs processed in parallel."""
 
-        # Process each CV independently in PARALLEL
-        tasks = [self._analyze_single_cv(cv, job_ad, detailed_criteria) for cv in cv_list]
-        results = await asyncio.gather(*tasks)
+        # Neither the criteria sections nor the prompt framing depend on the
+        # CV, so extract and format each criterion's prompt prefix once per
+        # analyze() call rather than once per CV
+        prefixes = {
+            criteria_key: f"""You are a recruiter. Evaluate this candidate against the "{criteria_name}" criteria.
+
+Job Description:
+{job_ad}
+
+Criteria Details:
+{extract_criteria_section(detailed_criteria, criteria_name)}""" + _RATING_INSTRUCTIONS
+            for criteria_name, criteria_key in self._CRITERIA_LIST
+        }
 
+        # Deterministic pre-filter: obviously-not-a-fit CVs get ranking=1
+        # locally, saving all three criteria calls each
         rankings = []
+        remaining = []
+        for cv in cv_list:
+            short_circuit = prefilter_cv(cv)
+            if short_circuit is not None:
+                if self.blind_mode:
+                    short_circuit.name = "[BLIND]"
+                rankings.append(short_circuit)
+            else:
+                remaining.append(cv)
+        n_prefiltered = len(rankings)
+
+        # Identical CV contents are evaluated once (3 calls instead of 3
+        # per copy); results are fanned back out to the duplicate cv_ids
+        groups: Dict[bytes, List[Dict[str, Any]]] = {}
+        for cv in remaining:
+            h = hashlib.blake2b(cv['content'].encode(), digest_size=16).digest()
+            groups.setdefault(h, []).append(cv)
+        duplicates = {cvs[0]['id']: cvs[1:] for cvs in groups.values() if len(cvs) > 1}
+        remaining = [cvs[0] for cvs in groups.values()]
+
+        # Layer 1: one flat gather over the whole criteria x CV matrix. The
+        # event loop sees every call up front, so slow responses for one CV
+        # no longer hold back the next CV's fan-out (the semaphore still
+        # caps how many are actually in flight)
+        tasks = [
+            self._evaluate_single_criteria(cv, prefixes[criteria_key])
+            for cv in remaining
+            for _, criteria_key in self._CRITERIA_LIST
+        ]
+        flat_results = await asyncio.gather(*tasks)
+
+        # Layer 2: scatter back per CV and aggregate algorithmically (no API call)
         all_criteria_evals = {}
+        n_criteria = len(self._CRITERIA_LIST)
 
-        for ranking_result, criteria_evaluations in results:
-            rankings.append(ranking_result)
-            all_criteria_evals[ranking_result.cv_id] = criteria_evaluations
+        for i, cv in enumerate(remaining):
+            criteria_evaluations = {
+                criteria_key: flat_results[i * n_criteria + j]
+                for j, (_, criteria_key) in enumerate(self._CRITERIA_LIST)
+            }
+            final_ranking, reasoning = self._aggregate_scores(criteria_evaluations)
+
+            # Extract name from CV content
+            cv_content = cv.get("content", "")
+            name = "Unknown"
+            if cv_content:
+                first_line = cv_content.split('\n')[0].strip()
+                name = first_line.replace('#', '').replace('_', '').strip()
+            if self.blind_mode:
+                name = "[BLIND]"
+
+            result = RankingResult(
+                cv_id=cv['id'],
+                name=name,
+                ranking=final_ranking,
+                reasoning=reasoning
+            )
+            rankings.append(result)
+            all_criteria_evals[cv['id']] = criteria_evaluations
+            for dup_cv in duplicates.get(cv['id'], ()):
+                rankings.append(result.model_copy(update={"cv_id": dup_cv['id']}))
+                all_criteria_evals[dup_cv['id']] = criteria_evaluations
 
         analysis = {
             "note": "Criteria evaluated via LLM (3 API calls per CV in parallel), aggregated algorithmically (simple average)",
             "total_cvs": len(cv_list),
+            "prefiltered_cvs": n_prefiltered,
+            "deduplicated_cvs": sum(len(dups) for dups in duplicates.values()),
             "blind_mode": self.blind_mode,
             "criteria_evaluations": all_criteria_evals,
             "aggregation_method": "Simple average of criteria scores (no weights)"
@@ -1,61 +1,123 @@
 """Multi-layer pipeline - iterative refinement approach."""
 import json
 import asyncio
+from collections import Counter
+
+import orjson
 from typing import Dict, Any, List
-from .base import Pipeline, PipelineResult, RankingResult
+from .base import Pipeline, PipelineResult, RankingResult, candidate_block, extract_json_from_response, extract_criteria_section, _RANKING_RE
 
 
 class MultiLayerPipeline(Pipeline):
     """Multi-layer analysis pipeline with iterative refinement."""
-    
-    def __init__(self, llm_provider):
+
+    _CRITERIA_LIST = [
+        ("Zero-to-One Operator", "zero_to_one"),
+        ("Technical T-Shape", "technical_t_shape"),
+        ("Recruitment Mastery", "recruitment_mastery")
+    ]
+
+    def __init__(self, llm_provider, fused: bool = False):
         super().__init__(llm_provider, "multi_layer")
-    
-    async def _analyze_single_cv(self, cv: Dict[str, Any], job_ad: str, detailed_criteria: str) -> tuple:
-        """Analyze a single CV independently with multi-layer approach."""
-        
-        # Layer 1: Evaluate each criteria separately for this CV
-        criteria_evaluations = {}
-        
-        criteria_list = [
-            ("Zero-to-One Operator", "zero_to_one"),
-            ("Technical T-Shape", "technical_t_shape"),
-            ("Recruitment Mastery", "recruitment_mastery")
-        ]
-        
-        for criteria_name, criteria_key in criteria_list:
-            # Extract relevant section from detailed_criteria
-            criteria_section = self._extract_criteria_section(detailed_criteria, criteria_name)
-            
-            criteria_prompt = f"""You are a recruiter. Evaluate this candidate against the "{criteria_name}" criteria.
+        # fused=True collapses the 3 criteria calls + synthesis into one
+        # structured-output call per CV (4x fewer calls and no re-shipped
+        # prefix). Default stays False so the layered path remains the
+        # baseline for comparison.
+        self.fused = fused
 
-Job Description:
-{job_ad}
+    async def _analyze_single_cv_fused(self, cv: Dict[str, Any], prompt_prefix: str) -> tuple:
+        """Evaluate all three criteria and the overall fit in one call."""
+        prompt = prompt_prefix + candidate_block(cv)
 
-Criteria Details:
-{criteria_section}
+        response = await self._generate(prompt, cached_prefix=prompt_prefix, max_tokens=512)
 
-Candidate CV:
-{cv['content']}
+        # Extract name from CV content
+        cv_content = cv.get("content", "")
+        name = "Unknown"
+        if cv_content:
+            first_line = cv_content.split('\n')[0].strip()
+            name = first_line.replace('#', '').replace('_', '').strip()
 
-Evaluate their fit to this specific criteria and rate as: Excellent, Good, Weak, or Not a Fit.
+        ranking = 0
+        reasoning = ""
+        criteria_eval_summary = {}
+        try:
+            parsed = extract_json_from_response(response.content)
+            if isinstance(parsed, dict):
+                ranking_value = parsed.get("ranking", 0)
+                if isinstance(ranking_value, int):
+                    ranking = ranking_value
+                elif isinstance(ranking_value, (float, str)):
+                    try:
+                        ranking = int(float(ranking_value))
+                    except (ValueError, TypeError):
+                        ranking = 0
+                reasoning = parsed.get("reasoning", "")
+                criteria_eval_summary = parsed.get("criteria_evaluations", {})
+            else:
+                reasoning = response.content
+        except (json.JSONDecodeError, KeyError, ValueError):
+            ranking_match = _RANKING_RE.search(response.content)
+            if ranking_match:
+                ranking = int(ranking_match.group(1))
+            reasoning = response.content
 
-Provide your evaluation in JSON format:
-{{
-    "cv_id": "{cv['id']}",
-    "rating": "Excellent/Good/Weak/Not a Fit"
-}}"""
+        ranking_result = RankingResult(
+            cv_id=cv['id'],
+            name=name,
+            ranking=ranking,
+            reasoning=reasoning
+        )
+
+        analysis_data = {
+            "fused_evaluation": {
+                "criteria_evaluations": criteria_eval_summary,
+                "ranking": ranking
+            }
+        }
 
-            criteria_response = await self.llm_provider.generate(criteria_prompt)
-            
+        return ranking_result, analysis_data, Counter(response.usage or {})
+
+    async def _analyze_single_cv(self, cv: Dict[str, Any], job_ad: str, prefixes: Dict[str, str]) -> tuple:
+        """Analyze a single CV independently with multi-layer approach."""
+
+        # Layer 1: Evaluate each criteria separately for this CV. The three
+        # evaluations don't depend on each other, so they're fired
+        # concurrently - only the synthesis call below needs their results,
+        # cutting per-CV latency from 4 round trips to 2. Only the candidate
+        # tail varies per CV, so providers can cache each criterion's prefix.
+        criteria_evaluations = {}
+
+        candidate_tail = candidate_block(cv)
+
+        # return_exceptions keeps one failed criteria call from aborting the
+        # other two; the failure is recorded like any other parse error and
+        # synthesis proceeds on whatever ratings came back
+        criteria_responses = await asyncio.gather(
+            *(
+                self._generate(
+                    prefixes[criteria_key] + candidate_tail,
+                    tier="fast",
+                    cached_prefix=prefixes[criteria_key],
+                    # The schema is a two-field JSON blob; output tokens are
+                    # generated sequentially, so a tight cap bounds latency
+                    max_tokens=128
+                )
+                for _, criteria_key in self._CRITERIA_LIST
+            ),
+            return_exceptions=True
+        )
+
+        for (_, criteria_key), criteria_response in zip(self._CRITERIA_LIST, criteria_responses):
+            if isinstance(criteria_response, BaseException):
+                criteria_evaluations[criteria_key] = {
+                    "cv_id": cv['id'],
+                    "error": str(criteria_response),
+                    "raw": ""
+                }
+                continue
             try:
-                content = criteria_response.content.strip()
-                if "```json" in content:
-                    content = content.split("```json")[1].split("```")[0].strip()
-                elif "```" in content:
-                    content = content.split("```")[1].split("```")[0].strip()
-                
-                parsed = json.loads(content)
+                parsed = extract_json_from_response(criteria_response.content)
                 criteria_evaluations[criteria_key] = {
                     "cv_id": cv['id'],
                     "rating": parsed.get("rating", "Unknown")
@@ -67,14 +129,21 @@ Provide your evaluation in JSON format:
                     "raw": criteria_response.content
                 }
         
-        # Layer 2: Synthesize overall fit based on criteria evaluations
+        # Layer 2: Synthesize overall fit based on criteria evaluations.
+        # Only the ratings inform synthesis - embedding the full evaluation
+        # dicts would re-bill the cv_id three times and, on parse failures,
+        # the entire raw response; compact JSON also skips billed whitespace
+        ratings_summary = {
+            key: evaluation.get('rating', 'Unknown')
+            for key, evaluation in criteria_evaluations.items()
+        }
         synthesis_prompt = f"""Based on the individual criteria evaluations below, determine the overall fit rating (1-4) for this candidate.
 
 Job Description:
 {job_ad}
 
 Individual Criteria Evaluations:
-{json.dumps(criteria_evaluations, indent=2)}
+{orjson.dumps(ratings_summary).decode()}
 
 Synthesize the three criteria evaluations into an overall fit rating for the role.
 
@@ -89,7 +158,7 @@ Provide your final ranking in JSON format:
     "ranking": 4
 }}"""
 
-        synthesis_response = await self.llm_provider.generate(synthesis_prompt)
+        synthesis_response = await self._generate(synthesis_prompt, max_tokens=512)
         
         # Extract name from CV content
         cv_content = cv.get("content", "")
@@ -103,14 +172,8 @@ Provide your final ranking in JSON format:
         reasoning = ""
         criteria_eval_summary = {}
         try:
-            content = synthesis_response.content.strip()
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0].strip()
-            elif "```" in content:
-                content = content.split("```")[1].split("```")[0].strip()
-            
-            parsed = json.loads(content)
-            
+            parsed = extract_json_from_response(synthesis_response.content)
+
             # Handle different response structures
             if isinstance(parsed, dict):
                 ranking_value = parsed.get("ranking", 0)
@@ -140,8 +203,7 @@ Provide your final ranking in JSON format:
                 
         except (json.JSONDecodeError, KeyError, ValueError):
             # Fallback: try to extract ranking from text
-            import re
-            ranking_match = re.search(r'"ranking"\s*:\s*(\d+)', synthesis_response.content)
+            ranking_match = _RANKING_RE.search(synthesis_response.content)
             if ranking_match:
                 ranking = int(ranking_match.group(1))
             else:
@@ -163,29 +225,111 @@ Provide your final ranking in JSON format:
                 "ranking": ranking
             }
         }
-        
-        return ranking_result, analysis_data
+
+        # Counter addition keeps whatever keys each provider reports
+        # (input_tokens/output_tokens vs prompt_tokens/completion_tokens)
+        # instead of silently dropping unrecognized ones
+        usage = Counter()
+        for response in criteria_responses:
+            if not isinstance(response, BaseException):
+                usage.update(response.usage or {})
+        usage.update(synthesis_response.usage or {})
+
+        return ranking_result, analysis_data, usage
     
     async def analyze(self, cv_list: List[Dict[str, Any]], job_ad: str, detailed_criteria: str) -> PipelineResult:
         """Perform multi-layer analysis - each CV evaluated independently."""
-        
+
+        if self.fused:
+            fused_prefix = f"""You are a recruiter evaluating a candidate for a Founding Operator role.
+
+Job Description:
+{job_ad}
+
+Detailed Hiring Criteria:
+{detailed_criteria}
+
+Rate the candidate against each criterion (Zero-to-One Operator, Technical T-Shape, Recruitment Mastery) as Excellent, Good, Weak, or Not a Fit, then synthesize an overall fit ranking from 1 (Not a Fit) to 4 (Excellent).
+
+Provide your response in JSON format, using the candidate's CV ID:
+{{
+    "cv_id": "<cv_id>",
+    "criteria_evaluations": {{
+        "zero_to_one": "Excellent/Good/Weak/Not a Fit",
+        "technical_t_shape": "Excellent/Good/Weak/Not a Fit",
+        "recruitment_mastery": "Excellent/Good/Weak/Not a Fit"
+    }},
+    "ranking": 4,
+    "reasoning": "<brief justification>"
+}}"""
+
+            tasks = [self._analyze_single_cv_fused(cv, fused_prefix) for cv in cv_list]
+            results = await asyncio.gather(*tasks)
+
+            rankings = []
+            all_analysis = {}
+            total_usage = Counter()
+            for ranking_result, analysis_data, usage in results:
+                rankings.append(ranking_result)
+                all_analysis[ranking_result.cv_id] = analysis_data
+                total_usage.update(usage)
+
+            return PipelineResult(
+                pipeline_name=self.name,
+                provider=self.llm_provider.get_provider_name(),
+                model=self.llm_provider.model,
+                rankings=rankings,
+                analysis={
+                    "note": "Fused mode - criteria ratings and synthesis in 1 API call per CV",
+                    "total_cvs": len(cv_list),
+                    "per_cv_analyses": all_analysis
+                },
+                metadata={
+                    "usage": dict(total_usage),
+                }
+            )
+
+        # Neither the criteria sections nor the prompt framing depend on the
+        # CV, so format each criterion's full prompt prefix once per
+        # analyze() call; only the candidate tail is added per CV
+        prefixes = {
+            criteria_key: f"""You are a recruiter. Evaluate this candidate against the "{criteria_name}" criteria.
+
+Job Description:
+{job_ad}
+
+Criteria Details:
+{extract_criteria_section(detailed_criteria, criteria_name)}
+
+Evaluate their fit to this specific criteria and rate as: Excellent, Good, Weak, or Not a Fit.
+
+Provide your evaluation in JSON format, using the candidate's CV ID:
+{{
+    "cv_id": "<cv_id>",
+    "rating": "Excellent/Good/Weak/Not a Fit"
+}}"""
+            for criteria_name, criteria_key in self._CRITERIA_LIST
+        }
+
         # Process each CV independently in parallel
-        tasks = [self._analyze_single_cv(cv, job_ad, detailed_criteria) for cv in cv_list]
+        tasks = [self._analyze_single_cv(cv, job_ad, prefixes) for cv in cv_list]
         results = await asyncio.gather(*tasks)
         
-        # Separate rankings and analysis
+        # Separate rankings and analysis, summing per-CV usage as we go
         rankings = []
         all_analysis = {}
-        for ranking_result, analysis_data in results:
+        total_usage = Counter()
+        for ranking_result, analysis_data, usage in results:
             rankings.append(ranking_result)
             all_analysis[ranking_result.cv_id] = analysis_data
-        
+            total_usage.update(usage)
+
         analysis = {
             "note": "Each CV evaluated independently - 4 API calls per CV (3 criteria + 1 synthesis)",
             "total_cvs": len(cv_list),
             "per_cv_analyses": all_analysis
         }
-        
+
         return PipelineResult(
             pipeline_name=self.name,
             provider=self.llm_provider.get_provider_name(),
@@ -193,27 +337,7 @@ Provide your final ranking in JSON format:
             rankings=rankings,
             analysis=analysis,
             metadata={
-                "usage": {"note": "Token usage not tracked per individual CV call"},
+                "usage": dict(total_usage),
             }
         )
     
-    def _extract_criteria_section(self, detailed_criteria: str, criteria_name: str) -> str:
-        """Extract the relevant section from detailed criteria."""
-        # Simple extraction - look for the criteria name
-        lines = detailed_criteria.split('\n')
-        start_idx = None
-        end_idx = None
-        
-        for i, line in enumerate(lines):
-            if criteria_name.lower() in line.lower() and '#' in line:
-                start_idx = i
-            elif start_idx is not None and line.strip().startswith('#') and criteria_name.lower() not in line.lower():
-                end_idx = i
-                break
-        
-        if start_idx is not None:
-            if end_idx is None:
-                end_idx = len(lines)
-            return '\n'.join(lines[start_idx:end_idx])
-        
-        return detailed_criteria  # Fallback to full criteria
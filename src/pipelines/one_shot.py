@@ -2,47 +2,61 @@
 import json
 import asyncio
 from typing import Dict, Any, List
-from .base import Pipeline, PipelineResult, RankingResult
+from .base import Pipeline, PipelineResult, RankingResult, candidate_block, extract_json_from_response, fit_cv_content, _RANKING_RE
 
 
 class OneShotPipeline(Pipeline):
     """Single prompt analysis pipeline."""
-    
-    def __init__(self, llm_provider):
+
+    supports_batch = True
+
+    def __init__(self, llm_provider, use_batch_api: bool = False):
         super().__init__(llm_provider, "one_shot")
-    
-    async def _analyze_single_cv(self, cv: Dict[str, Any], job_ad: str, detailed_criteria: str) -> RankingResult:
-        """Analyze a single CV independently."""
-        prompt = f"""You are a recruiter evaluating a candidate for a Founding Operator role. 
+        # use_batch_api routes the per-CV fan-out through the provider's
+        # half-price batch endpoint (minutes-scale turnaround) when the
+        # provider implements generate_batch; otherwise it is ignored
+        self.use_batch_api = use_batch_api
+
+    def _build_prompt_prefix(self, job_ad: str, detailed_criteria: str) -> str:
+        """Invariant portion of the per-CV prompt, shared across all CVs."""
+        return f"""You are a recruiter evaluating a candidate for a Founding Operator role.
 
 Job Description:
 {job_ad}
 
 You will be evaluating this candidate against three key criteria:
 1. Zero-to-One Operator
-2. Technical T-Shape  
+2. Technical T-Shape
 3. Recruitment Mastery
 
 Detailed Hiring Criteria:
 {detailed_criteria}
 
-Candidate CV:
-{cv['content']}
-
 Provide a fit rating from 1-4 of the candidate for the role:
 - 4 = Excellent fit
 - 3 = Good fit
 - 2 = Borderline fit
 - 1 = Not a fit
 
-Provide your response in JSON format:
+Provide your response in JSON format, using the candidate's CV ID:
 {{
-    "cv_id": "{cv['id']}",
+    "cv_id": "<cv_id>",
     "ranking": 4
 }}"""
 
-        response = await self.llm_provider.generate(prompt)
-        
+
+    async def _analyze_single_cv(self, cv: Dict[str, Any], prompt_prefix: str) -> RankingResult:
+        """Analyze a single CV independently."""
+        # Only the tail varies per CV; providers can cache the shared prefix
+        prompt = prompt_prefix + candidate_block(cv)
+
+        # The requested schema is cv_id + ranking (plus optional reasoning);
+        # a tight output cap bounds per-CV decode latency and cost
+        response = await self._generate(prompt, cached_prefix=prompt_prefix, max_tokens=256)
+        return self._parse_ranking_response(cv, response)
+
+    def _parse_ranking_response(self, cv: Dict[str, Any], response) -> RankingResult:
+        """Turn one per-CV response into a RankingResult."""
         # Extract name from CV content
         cv_content = cv.get("content", "")
         name = "Unknown"
@@ -54,14 +68,8 @@ Provide your response in JSON format:
         ranking = 0
         reasoning = ""
         try:
-            content = response.content.strip()
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0].strip()
-            elif "```" in content:
-                content = content.split("```")[1].split("```")[0].strip()
-            
-            parsed = json.loads(content)
-            
+            parsed = extract_json_from_response(response.content)
+
             # Handle different response structures
             if isinstance(parsed, dict):
                 # Direct ranking
@@ -100,9 +108,7 @@ Provide your response in JSON format:
                 
         except (json.JSONDecodeError, KeyError, ValueError):
             # Fallback: try to extract ranking from text
-            import re
-            # Look for ranking pattern in text
-            ranking_match = re.search(r'"ranking"\s*:\s*(\d+)', response.content)
+            ranking_match = _RANKING_RE.search(response.content)
             if ranking_match:
                 ranking = int(ranking_match.group(1))
             else:
@@ -116,12 +122,127 @@ Provide your response in JSON format:
             reasoning=reasoning
         )
     
+    async def analyze_batch(self, cv_list: List[Dict[str, Any]], job_ad: str, detailed_criteria: str) -> PipelineResult:
+        """Evaluate all CVs in a single LLM call instead of one call per CV."""
+        cv_blocks = "\n\n".join(
+            f"--- Candidate {cv['id']} ---\n{fit_cv_content(cv['content'])}" for cv in cv_list
+        )
+        prompt = f"""You are a recruiter evaluating candidates for a Founding Operator role.
+
+Job Description:
+{job_ad}
+
+You will be evaluating each candidate against three key criteria:
+1. Zero-to-One Operator
+2. Technical T-Shape
+3. Recruitment Mastery
+
+Detailed Hiring Criteria:
+{detailed_criteria}
+
+Candidate CVs:
+{cv_blocks}
+
+For EACH candidate, provide a fit rating from 1-4 for the role:
+- 4 = Excellent fit
+- 3 = Good fit
+- 2 = Borderline fit
+- 1 = Not a fit
+
+Provide your response in JSON format as an array with one entry per candidate:
+[
+    {{"cv_id": "<id>", "ranking": 4}},
+    ...
+]"""
+
+        response = await self._generate(prompt)
+
+        # Parse the JSON array from the response
+        rankings_by_id = {}
+        try:
+            parsed = extract_json_from_response(response.content)
+            if isinstance(parsed, dict):
+                # Some models wrap the array in an object
+                for value in parsed.values():
+                    if isinstance(value, list):
+                        parsed = value
+                        break
+            if isinstance(parsed, list):
+                for entry in parsed:
+                    if isinstance(entry, dict) and "cv_id" in entry:
+                        try:
+                            rankings_by_id[entry["cv_id"]] = int(float(entry.get("ranking")))
+                        except (ValueError, TypeError):
+                            pass
+        except (json.JSONDecodeError, KeyError, ValueError):
+            pass
+
+        results_by_id = {}
+        missing = []
+        for cv in cv_list:
+            ranking = rankings_by_id.get(cv['id'])
+            if ranking is None:
+                missing.append(cv)
+                continue
+            cv_content = cv.get("content", "")
+            name = "Unknown"
+            if cv_content:
+                first_line = cv_content.split('\n')[0].strip()
+                name = first_line.replace('#', '').replace('_', '').strip()
+            results_by_id[cv['id']] = RankingResult(
+                cv_id=cv['id'],
+                name=name,
+                ranking=ranking,
+                reasoning=""
+            )
+
+        # Any CV the batched response failed to cover (omitted from the
+        # array, or with a non-numeric ranking) falls back to the per-CV
+        # path rather than being emitted as an indistinguishable 0
+        if missing:
+            prompt_prefix = self._build_prompt_prefix(job_ad, detailed_criteria)
+            for result in await asyncio.gather(
+                *(self._analyze_single_cv(cv, prompt_prefix) for cv in missing)
+            ):
+                results_by_id[result.cv_id] = result
+
+        return PipelineResult(
+            pipeline_name=self.name,
+            provider=self.llm_provider.get_provider_name(),
+            model=self.llm_provider.model,
+            rankings=[results_by_id[cv['id']] for cv in cv_list],
+            analysis={
+                "note": "All CVs evaluated in a single batched API call",
+                "total_cvs": len(cv_list),
+                "fallback_cvs": len(missing)
+            },
+            metadata={
+                "usage": response.usage or {},
+                "batched": True
+            }
+        )
+
     async def analyze(self, cv_list: List[Dict[str, Any]], job_ad: str, detailed_criteria: str) -> PipelineResult:
         """Perform one-shot analysis of all CVs - one API call per CV."""
-        
-        # Process each CV independently in parallel
-        tasks = [self._analyze_single_cv(cv, job_ad, detailed_criteria) for cv in cv_list]
-        rankings = await asyncio.gather(*tasks)
+
+        # The job ad, criteria, and instructions are identical for every CV;
+        # keeping them in a shared prefix before the candidate marker lets
+        # providers reuse their prompt cache across CVs
+        prompt_prefix = self._build_prompt_prefix(job_ad, detailed_criteria)
+
+        if self.use_batch_api and hasattr(self.llm_provider, "generate_batch"):
+            # One submission for the whole CV list at batch pricing; results
+            # come back keyed by position and are parsed identically
+            prompts = [prompt_prefix + candidate_block(cv) for cv in cv_list]
+            responses = await self.llm_provider.generate_batch(prompts, max_tokens=256)
+            rankings = [
+                self._parse_ranking_response(cv, response)
+                for cv, response in zip(cv_list, responses)
+            ]
+        else:
+            # Process each CV independently in parallel
+            tasks = [self._analyze_single_cv(cv, prompt_prefix) for cv in cv_list]
+            rankings = await asyncio.gather(*tasks)
         
         # Calculate total usage
         total_usage = {
@@ -1,8 +1,13 @@
 """Anthropic Claude LLM provider implementation."""
+import asyncio
 import os
+from typing import AsyncIterator, List
+
 from anthropic import AsyncAnthropic
 from .base import LLMProvider, LLMResponse
 
+_SYSTEM_PROMPT = "You are an expert CV analyst with deep knowledge of recruitment and talent assessment."
+
 
 class AnthropicProvider(LLMProvider):
     """Anthropic provider for Claude models."""
@@ -16,39 +21,137 @@ class AnthropicProvider(LLMProvider):
     
     async def generate(self, prompt: str, **kwargs) -> LLMResponse:
         """Generate a response using Anthropic API."""
+        await self._throttle()
         temperature = kwargs.get("temperature", self.temperature)
         max_tokens = kwargs.get("max_tokens", self.max_tokens)
-        
-        response = await self.client.messages.create(
+
+        # When the caller marks the invariant prompt prefix, send it as its
+        # own content block with cache_control so the API pins it in its
+        # prompt cache and only the per-CV tail is re-prefilled
+        cached_prefix = kwargs.get("cached_prefix")
+        if cached_prefix and prompt.startswith(cached_prefix):
+            content = [
+                {
+                    "type": "text",
+                    "text": cached_prefix,
+                    "cache_control": {"type": "ephemeral"},
+                },
+                {"type": "text", "text": prompt[len(cached_prefix):]},
+            ]
+        else:
+            content = prompt
+
+        # Stream the response instead of blocking on the full generation:
+        # text accumulates as tokens arrive, so the caller can parse the
+        # moment the last token lands rather than after an extra round trip
+        text_parts = []
+        async with self.client.messages.stream(
             model=self.model,
             max_tokens=max_tokens,
             temperature=temperature,
-            system="You are an expert CV analyst with deep knowledge of recruitment and talent assessment.",
+            system=_SYSTEM_PROMPT,
             messages=[
-                {"role": "user", "content": prompt}
+                {"role": "user", "content": content}
             ]
-        )
-        
-        # Extract content (Anthropic returns a list of content blocks)
-        content = ""
-        if response.content:
-            for block in response.content:
-                if hasattr(block, 'text'):
-                    content += block.text
-                elif isinstance(block, dict) and 'text' in block:
-                    content += block['text']
-        
-        return LLMResponse(
-            content=content,
+        ) as stream:
+            async for text in stream.text_stream:
+                text_parts.append(text)
+            final = await stream.get_final_message()
+
+        # model_construct skips field validation - these are trusted,
+        # provider-built values and this runs once per API call
+        return LLMResponse.model_construct(
+            content="".join(text_parts),
             model=self.model,
             usage={
-                "input_tokens": response.usage.input_tokens,
-                "output_tokens": response.usage.output_tokens,
-                "total_tokens": response.usage.input_tokens + response.usage.output_tokens
+                "input_tokens": final.usage.input_tokens,
+                "output_tokens": final.usage.output_tokens,
+                "total_tokens": final.usage.input_tokens + final.usage.output_tokens
             },
-            metadata={"stop_reason": response.stop_reason}
+            metadata={"stop_reason": final.stop_reason}
         )
     
+    async def generate_stream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        """Yield response text incrementally as tokens arrive.
+
+        generate() already streams internally; this exposes the chunks to
+        callers that want to process text at first-chunk latency.
+        """
+        await self._throttle()
+        async with self.client.messages.stream(
+            model=self.model,
+            max_tokens=kwargs.get("max_tokens", self.max_tokens),
+            temperature=kwargs.get("temperature", self.temperature),
+            system=_SYSTEM_PROMPT,
+            messages=[{"role": "user", "content": prompt}],
+        ) as stream:
+            async for text in stream.text_stream:
+                yield text
+
+    async def generate_batch(self, prompts: List[str], **kwargs) -> List[LLMResponse]:
+        """Submit many independent prompts through the Message Batches API.
+
+        Batched requests cost half the synchronous per-token price and are
+        throttled server-side, so rate limits stop being the caller's
+        problem - at the cost of minutes-scale turnaround. Only worth it
+        for offline runs that are not latency-critical.
+        """
+        temperature = kwargs.get("temperature", self.temperature)
+        max_tokens = kwargs.get("max_tokens", self.max_tokens)
+
+        batch = await self.client.messages.batches.create(
+            requests=[
+                {
+                    "custom_id": str(i),
+                    "params": {
+                        "model": self.model,
+                        "max_tokens": max_tokens,
+                        "temperature": temperature,
+                        "system": _SYSTEM_PROMPT,
+                        "messages": [{"role": "user", "content": prompt}],
+                    },
+                }
+                for i, prompt in enumerate(prompts)
+            ]
+        )
+
+        while batch.processing_status == "in_progress":
+            await asyncio.sleep(5)
+            batch = await self.client.messages.batches.retrieve(batch.id)
+
+        responses: List[LLMResponse] = [
+            LLMResponse(content="", model=self.model, metadata={"batch_error": "missing"})
+        ] * len(prompts)
+        async for entry in await self.client.messages.batches.results(batch.id):
+            idx = int(entry.custom_id)
+            if entry.result.type == "succeeded":
+                message = entry.result.message
+                # Non-tool-use responses carry exactly one text block;
+                # fall back to the join only for multi-block responses
+                if len(message.content) == 1:
+                    text = message.content[0].text
+                else:
+                    text = "".join(
+                        block.text for block in message.content if hasattr(block, 'text')
+                    )
+                responses[idx] = LLMResponse.model_construct(
+                    content=text,
+                    model=self.model,
+                    usage={
+                        "input_tokens": message.usage.input_tokens,
+                        "output_tokens": message.usage.output_tokens,
+                        "total_tokens": message.usage.input_tokens + message.usage.output_tokens
+                    },
+                    metadata={"stop_reason": message.stop_reason, "batched": True}
+                )
+            else:
+                responses[idx] = LLMResponse(
+                    content="",
+                    model=self.model,
+                    metadata={"batch_error": entry.result.type}
+                )
+        return responses
+
     def get_provider_name(self) -> str:
         return "anthropic"
 
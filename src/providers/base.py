@@ -1,8 +1,31 @@
 """Base class for LLM providers."""
+import asyncio
+import random
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from pydantic import BaseModel
 
+from .concurrency import rate_limiter_for
+
+_RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504, 529}
+
+# Matched by name so this module stays SDK-agnostic: covers openai
+# (RateLimitError, APITimeoutError, ...), google.api_core
+# (ResourceExhausted, ...) and raw httpx transport failures
+_RETRYABLE_NAMES = {
+    "RateLimitError", "APITimeoutError", "APIConnectionError",
+    "InternalServerError", "ResourceExhausted", "ServiceUnavailable",
+    "DeadlineExceeded", "ConnectError", "ConnectTimeout", "ReadTimeout",
+    "RemoteProtocolError",
+}
+
+
+def _is_transient(err: Exception) -> bool:
+    status = getattr(err, "status_code", None)
+    if status is None:
+        status = getattr(getattr(err, "response", None), "status_code", None)
+    return status in _RETRYABLE_STATUS or type(err).__name__ in _RETRYABLE_NAMES
+
 
 class LLMResponse(BaseModel):
     """Response from an LLM call."""
@@ -19,7 +42,40 @@ class LLMProvider(ABC):
         self.model = model
         self.temperature = temperature
         self.max_tokens = max_tokens
-    
+        # Client-side RPM throttle, shared across instances of the same
+        # provider (one API key means one server-side limit). Disabled
+        # unless LLM_RPM_LIMIT / <PROVIDER>_RPM_LIMIT is set.
+        self._rate_limiter = rate_limiter_for(self.get_provider_name())
+
+    async def _throttle(self) -> None:
+        """Wait for a request slot when an RPM limit is configured."""
+        if self._rate_limiter is not None:
+            await self._rate_limiter.acquire()
+
+    async def _with_retry(self, fn, *args, retries: int = 5, base: float = 0.5,
+                          cap: float = 20.0, **kwargs):
+        """Await fn(), retrying transient failures with full-jitter backoff.
+
+        Only rate limits, 5xx responses, and connection-level failures are
+        retried - permanent errors (auth, bad request) surface immediately.
+        A Retry-After header, when present, overrides the computed delay.
+        """
+        for attempt in range(retries + 1):
+            try:
+                return await fn(*args, **kwargs)
+            except Exception as err:
+                if attempt == retries or not _is_transient(err):
+                    raise
+                delay = min(cap, base * 2 ** attempt) * random.random()
+                headers = getattr(getattr(err, "response", None), "headers", None)
+                retry_after = headers.get("retry-after") if headers else None
+                if retry_after:
+                    try:
+                        delay = float(retry_after)
+                    except ValueError:
+                        pass
+                await asyncio.sleep(delay)
+
     @abstractmethod
     async def generate(self, prompt: str, **kwargs) -> LLMResponse:
         """Generate a response from the LLM.
@@ -33,6 +89,26 @@ class LLMProvider(ABC):
         """
         pass
     
+    async def generate_many(self, prompts: List[str], max_concurrency: int = 16,
+                            **kwargs) -> List["LLMResponse"]:
+        """Generate responses for many prompts with bounded concurrency.
+
+        Prompts are issued grouped by their leading 512 characters so
+        same-prefix streaks reach the server back to back, keeping the
+        provider's prefix cache warm instead of letting unrelated prompts
+        evict it between hits. Results come back in the original order.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        results: List[Optional[LLMResponse]] = [None] * len(prompts)
+
+        async def run(i: int) -> None:
+            async with semaphore:
+                results[i] = await self.generate(prompts[i], **kwargs)
+
+        order = sorted(range(len(prompts)), key=lambda i: prompts[i][:512])
+        await asyncio.gather(*(run(i) for i in order))
+        return results
+
     @abstractmethod
     def get_provider_name(self) -> str:
         """Return the name of the provider."""
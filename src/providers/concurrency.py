@@ -0,0 +1,56 @@
+"""Client-side request throttling shared by the providers."""
+import asyncio
+import os
+import time
+from typing import Dict, Optional
+
+
+class AsyncTokenBucket:
+    """Token bucket granting up to rate_per_min request slots per minute.
+
+    Tokens refill continuously; acquire() waits just long enough for the
+    next token instead of sleeping a fixed interval, so a steady stream of
+    requests spreads evenly under the limit rather than bursting into 429s.
+    """
+
+    def __init__(self, rate_per_min: float, burst: Optional[float] = None):
+        self.rate = rate_per_min / 60.0
+        # Default headroom of ten seconds' worth of requests
+        self.capacity = burst if burst is not None else max(1.0, rate_per_min / 6.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        # Holding the lock while waiting keeps acquirers roughly FIFO
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+# One bucket per provider name: every instance of a provider shares the
+# same API key, hence the same server-side rate limit
+_buckets: Dict[str, Optional[AsyncTokenBucket]] = {}
+
+
+def rate_limiter_for(provider_name: str) -> Optional[AsyncTokenBucket]:
+    """Shared bucket for a provider, or None when no limit is configured.
+
+    The limit comes from <PROVIDER>_RPM_LIMIT (e.g. OPENAI_RPM_LIMIT),
+    falling back to LLM_RPM_LIMIT; unset or 0 disables throttling.
+    """
+    if provider_name not in _buckets:
+        rpm = float(os.environ.get(
+            f"{provider_name.upper()}_RPM_LIMIT",
+            os.environ.get("LLM_RPM_LIMIT", 0),
+        ))
+        _buckets[provider_name] = AsyncTokenBucket(rpm) if rpm > 0 else None
+    return _buckets[provider_name]
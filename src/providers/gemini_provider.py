@@ -1,8 +1,89 @@
 """Google Gemini LLM provider implementation."""
+import asyncio
+import functools
+import logging
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import google.generativeai as genai
 from .base import LLMProvider, LLMResponse
 
+logger = logging.getLogger(__name__)
+
+_SYSTEM_PROMPT = "You are an expert CV analyst with deep knowledge of recruitment and talent assessment."
+
+# Fallback pool for SDKs without generate_content_async: generate()
+# offloads each call to a thread, and a dedicated pool keeps the fan-out
+# from being capped by (or starving) the event loop's default executor.
+_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("GEMINI_MAX_WORKERS", 16)),
+    thread_name_prefix="gemini",
+)
+
+# Canonical names that never need a list_models() round-trip to resolve;
+# anything else falls through to the network-backed validation
+_KNOWN_GEMINI_MODELS = frozenset({
+    "gemini-1.5-pro", "gemini-1.5-pro-latest",
+    "gemini-1.5-flash", "gemini-1.5-flash-latest",
+    "gemini-2.0-flash", "gemini-2.0-flash-lite",
+    "gemini-2.5-pro", "gemini-2.5-flash",
+})
+
+# list_models() is a network round-trip enumerating every model; cache it
+# so repeated provider instantiations and fallback searches share one call
+_MODELS_CACHE = None  # (monotonic timestamp, models)
+_MODELS_LOCK = threading.Lock()
+
+
+def _get_models(ttl: float = 300.0):
+    global _MODELS_CACHE
+    with _MODELS_LOCK:
+        now = time.monotonic()
+        if _MODELS_CACHE is None or now - _MODELS_CACHE[0] >= ttl:
+            _MODELS_CACHE = (now, list(genai.list_models()))
+        return _MODELS_CACHE[1]
+
+
+@functools.lru_cache(maxsize=8)
+def _make_extractor(resp_type):
+    """Build a (response) -> (content, usage, finish_reason) closure.
+
+    Which attributes a response carries is fixed per SDK response class,
+    so the shape probes run once per type here instead of re-running a
+    hasattr chain on every single response.
+    """
+    has_text = hasattr(resp_type, "text")
+    has_candidates = hasattr(resp_type, "candidates")
+    has_usage = hasattr(resp_type, "usage_metadata")
+
+    def extract(response):
+        content = ""
+        if has_text:
+            content = response.text
+        elif has_candidates and response.candidates:
+            candidate = response.candidates[0]
+            content = (candidate.content.parts[0].text
+                       if hasattr(candidate.content, 'parts') else str(candidate))
+
+        usage = None
+        if has_usage:
+            usage_meta = response.usage_metadata
+            usage = {
+                "prompt_tokens": getattr(usage_meta, 'prompt_token_count', 0),
+                "completion_tokens": getattr(usage_meta, 'completion_token_count', 0),
+                "total_tokens": getattr(usage_meta, 'total_token_count', 0)
+            }
+
+        finish_reason = None
+        if has_candidates and response.candidates:
+            finish_reason = getattr(response.candidates[0], 'finish_reason', None)
+
+        return content, usage, finish_reason
+
+    return extract
+
 
 class GeminiProvider(LLMProvider):
     """Google Gemini provider for Gemini models."""
@@ -17,133 +98,176 @@ class GeminiProvider(LLMProvider):
         
         # Validate model exists and get correct name
         self._validate_model()
-    
+
+        # One GenerativeModel reused across calls; constructing it per
+        # request re-validated config on every single generate(). The
+        # system text rides as system_instruction rather than being
+        # prepended to every user prompt, keeping per-CV prompts smaller
+        # and their shared prefix byte-identical for caching.
+        try:
+            self._model_instance = genai.GenerativeModel(
+                self.model.replace("models/", ""),
+                system_instruction=_SYSTEM_PROMPT,
+            )
+        except Exception:
+            # Defer to the first generate() call, which can fall back
+            self._model_instance = None
+
+    def _rebuild_model_instance(self):
+        """Find a usable model after a 404 and rebuild the shared instance."""
+        logger.warning("Model '%s' not found, searching for alternatives...", self.model)
+        available_models = _get_models()
+        for m in available_models:
+            if 'generateContent' in m.supported_generation_methods:
+                fallback_name = m.name.replace('models/', '')
+                self._model_instance = genai.GenerativeModel(
+                    fallback_name, system_instruction=_SYSTEM_PROMPT
+                )
+                logger.warning("Using available Gemini model: %s", fallback_name)
+                self.model = fallback_name  # Update for future calls
+                return
+        raise ValueError("No Gemini models available for generateContent")
+
     def _validate_model(self):
         """Validate model exists and get correct model name."""
+        # Well-known canonical names skip the round-trip entirely; a stale
+        # entry still surfaces as a 404 handled by _rebuild_model_instance
+        if self.model.replace("models/", "") in _KNOWN_GEMINI_MODELS:
+            self.model = self.model.replace("models/", "")
+            return
         try:
-            available_models = list(genai.list_models())
-            model_names = [m.name.replace('models/', '') for m in available_models 
+            available_models = _get_models()
+            model_names = [m.name.replace('models/', '') for m in available_models
                           if 'generateContent' in m.supported_generation_methods]
             
             if not model_names:
-                print("Warning: No Gemini models found with generateContent support")
+                logger.warning("No Gemini models found with generateContent support")
                 return
+
+            logger.debug("Available Gemini models: %s", model_names[:5])
             
-            # Print available models for debugging
-            print(f"  Available Gemini models: {', '.join(model_names[:5])}")
-            
-            # Try to find matching model
-            model_found = False
-            requested_base = self.model.replace('-latest', '').replace('models/', '')
-            
+            # Exact matches resolve through one dict lookup; the scan only
+            # runs for versioned variants (e.g. "gemini-1.5-pro" -> "-001")
+            index = {}
             for available_name in model_names:
-                available_base = available_name.replace('models/', '')
-                # Check exact match
-                if self.model == available_name or self.model == f"models/{available_name}":
-                    self.model = available_name
-                    model_found = True
-                    break
-                # Check if base names match (e.g., "gemini-1.5-pro" matches "gemini-1.5-pro-001")
-                if requested_base in available_base or available_base.startswith(requested_base):
-                    self.model = available_name
-                    model_found = True
-                    print(f"  Matched '{self.model}' to available model '{available_name}'")
-                    break
-            
-            if not model_found and model_names:
+                index[available_name] = available_name
+                index[f"models/{available_name}"] = available_name
+
+            canonical = index.get(self.model)
+            if canonical is None:
+                requested_base = self.model.replace('-latest', '').replace('models/', '')
+                canonical = next(
+                    (name for name in model_names
+                     if requested_base in name or name.startswith(requested_base)),
+                    None
+                )
+                if canonical is not None:
+                    logger.debug("Matched '%s' to available model '%s'", self.model, canonical)
+
+            if canonical is not None:
+                self.model = canonical
+            elif model_names:
                 # Use first available model as fallback
                 original_model = self.model
                 self.model = model_names[0]
-                print(f"Warning: Model '{original_model}' not found. Using '{self.model}' instead.")
+                logger.warning("Model '%s' not found. Using '%s' instead.", original_model, self.model)
         except Exception as e:
-            print(f"Warning: Could not validate Gemini model: {e}")
+            logger.warning("Could not validate Gemini model: %s", e)
             # Continue with original model name
     
+    def _ensure_model_instance(self):
+        """Shared model instance; only rebuilt if __init__'s construction
+        failed with a missing model."""
+        if self._model_instance is None:
+            try:
+                self._model_instance = genai.GenerativeModel(
+                    self.model.replace("models/", ""),
+                    system_instruction=_SYSTEM_PROMPT,
+                )
+            except Exception as e:
+                error_msg = str(e)
+                if "404" in error_msg or "not found" in error_msg.lower() or "does not exist" in error_msg.lower():
+                    try:
+                        self._rebuild_model_instance()
+                    except Exception as e2:
+                        raise ValueError(f"Could not find Gemini model '{self.model}' and no alternatives available: {e2}")
+                else:
+                    raise  # Re-raise if it's a different error
+        return self._model_instance
+
     async def generate(self, prompt: str, **kwargs) -> LLMResponse:
         """Generate a response using Gemini API."""
-        import asyncio
+        await self._throttle()
         temperature = kwargs.get("temperature", self.temperature)
         max_tokens = kwargs.get("max_tokens", self.max_tokens)
-        
-        # Create model instance
-        # Handle models/ prefix if present
-        model_name = self.model.replace("models/", "") if self.model.startswith("models/") else self.model
-        
-        # Try to create model, with fallback to first available model
-        try:
-            model_instance = genai.GenerativeModel(model_name)
-        except Exception as e:
-            # If model not found, try to get first available model
-            error_msg = str(e)
-            if "404" in error_msg or "not found" in error_msg.lower() or "does not exist" in error_msg.lower():
-                try:
-                    print(f"  Model '{model_name}' not found, searching for alternatives...")
-                    available_models = list(genai.list_models())
-                    for m in available_models:
-                        if 'generateContent' in m.supported_generation_methods:
-                            fallback_name = m.name.replace('models/', '')
-                            model_instance = genai.GenerativeModel(fallback_name)
-                            print(f"  Using available Gemini model: {fallback_name}")
-                            self.model = fallback_name  # Update for future calls
-                            break
-                    else:
-                        raise ValueError("No Gemini models available for generateContent")
-                except Exception as e2:
-                    raise ValueError(f"Could not find Gemini model '{self.model}' and no alternatives available: {e2}")
-            else:
-                raise  # Re-raise if it's a different error
-        
-        # Build the full prompt with system message
-        full_prompt = f"""You are an expert CV analyst with deep knowledge of recruitment and talent assessment.
 
-{prompt}"""
-        
+        model_instance = self._ensure_model_instance()
+
         # Generate content
         # Note: Gemini uses generation_config for parameters
-        # Run in executor since Gemini SDK may not be fully async
         generation_config = {
             "temperature": temperature,
             "max_output_tokens": max_tokens,
         }
-        
-        loop = asyncio.get_event_loop()
-        response = await loop.run_in_executor(
-            None,
-            lambda: model_instance.generate_content(
-                full_prompt,
-                generation_config=generation_config
+
+        if hasattr(model_instance, "generate_content_async"):
+            # Native async call: no thread hop, no executor cap
+            response = await self._with_retry(
+                model_instance.generate_content_async,
+                prompt, generation_config=generation_config,
+            )
+        else:
+            loop = asyncio.get_running_loop()
+            call = functools.partial(
+                model_instance.generate_content,
+                prompt,
+                generation_config=generation_config,
+            )
+            response = await self._with_retry(
+                lambda: loop.run_in_executor(_EXECUTOR, call)
             )
-        )
-        
-        # Extract content - handle different response formats
-        content = ""
-        if hasattr(response, 'text'):
-            content = response.text
-        elif hasattr(response, 'candidates') and response.candidates:
-            content = response.candidates[0].content.parts[0].text if hasattr(response.candidates[0].content, 'parts') else str(response.candidates[0])
-        
-        # Extract usage information if available
-        usage = None
-        if hasattr(response, 'usage_metadata'):
-            usage_meta = response.usage_metadata
-            usage = {
-                "prompt_tokens": getattr(usage_meta, 'prompt_token_count', 0),
-                "completion_tokens": getattr(usage_meta, 'completion_token_count', 0),
-                "total_tokens": getattr(usage_meta, 'total_token_count', 0)
-            }
-        
-        # Extract finish reason
-        finish_reason = None
-        if hasattr(response, 'candidates') and response.candidates:
-            finish_reason = getattr(response.candidates[0], 'finish_reason', None)
         
-        return LLMResponse(
+        # Extraction path specialized per response class, probed once
+        content, usage, finish_reason = _make_extractor(type(response))(response)
+
+
+        # model_construct skips field validation - these are trusted,
+        # provider-built values and this runs once per API call
+        return LLMResponse.model_construct(
             content=content,
             model=self.model,
             usage=usage,
             metadata={"finish_reason": finish_reason}
         )
     
+    async def generate_stream(self, prompt: str, **kwargs):
+        """Yield response text incrementally as tokens arrive.
+
+        Lets callers start processing at first-chunk latency instead of
+        waiting for the slowest token of the full completion. Falls back
+        to one whole-response chunk on SDKs without async streaming.
+        """
+        await self._throttle()
+        model_instance = self._ensure_model_instance()
+        generation_config = {
+            "temperature": kwargs.get("temperature", self.temperature),
+            "max_output_tokens": kwargs.get("max_tokens", self.max_tokens),
+        }
+
+        if hasattr(model_instance, "generate_content_async"):
+            stream = await self._with_retry(
+                model_instance.generate_content_async,
+                prompt, generation_config=generation_config, stream=True,
+            )
+            async for chunk in stream:
+                text = getattr(chunk, "text", "")
+                if text:
+                    yield text
+        else:
+            response = await self.generate(prompt, **kwargs)
+            if response.content:
+                yield response.content
+
     def get_provider_name(self) -> str:
         return "gemini"
 
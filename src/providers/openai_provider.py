@@ -1,8 +1,76 @@
 """OpenAI LLM provider implementation."""
+import asyncio
+import functools
+import hashlib
 import os
-from openai import AsyncOpenAI
+from typing import AsyncIterator, Dict, List
+
+import httpx
+import orjson
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
 from .base import LLMProvider, LLMResponse
 
+try:
+    import tiktoken
+except ImportError:  # optional: without it the pre-flight check is skipped
+    tiktoken = None
+
+_SYSTEM_PROMPT = "You are an expert CV analyst with deep knowledge of recruitment and talent assessment."
+_SYSTEM_MSG = {"role": "system", "content": _SYSTEM_PROMPT}
+
+# Context windows for the models we run; unknown models get the 128k
+# floor shared by every current 4o-and-later model
+_MODEL_CTX = {
+    "gpt-4": 8192,
+    "gpt-4-turbo": 128000,
+    "gpt-3.5-turbo": 16385,
+}
+_DEFAULT_CTX = 128000
+
+
+@functools.lru_cache(maxsize=8)
+def _enc(model: str):
+    """Encoder for a model, or None when one can't be loaded.
+
+    tiktoken fetches encoder data over the network on first use, so an
+    installed-but-offline tiktoken must degrade the same way as a
+    missing one.
+    """
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        pass
+    except Exception:
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+# One client (and hence one connection pool) per API key: separate
+# provider instances for different models would otherwise each open
+# their own pool and lose keep-alive reuse between them
+_OPENAI_CLIENTS: Dict[str, AsyncOpenAI] = {}
+
+
+def _client_for(api_key: str) -> AsyncOpenAI:
+    client = _OPENAI_CLIENTS.get(api_key)
+    if client is None:
+        # Pool sized for the pipelines' fan-out so bursts reuse keep-alive
+        # connections instead of opening one per request
+        client = AsyncOpenAI(
+            api_key=api_key,
+            http_client=DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=256,
+                    max_keepalive_connections=128,
+                    keepalive_expiry=30.0,
+                )
+            ),
+        )
+        _OPENAI_CLIENTS[api_key] = client
+    return client
+
 
 class OpenAIProvider(LLMProvider):
     """OpenAI provider for GPT models."""
@@ -12,37 +80,69 @@ class OpenAIProvider(LLMProvider):
         api_key = os.getenv("OPENAI_API_KEY")
         if not api_key:
             raise ValueError("OPENAI_API_KEY environment variable not set")
-        self.client = AsyncOpenAI(api_key=api_key)
+        self.client = _client_for(api_key)
+        # GPT-5 models have different parameter requirements; resolve the
+        # branch once here instead of on every request
+        self._is_gpt5 = self.model.startswith("gpt-5")
+        self._tokens_key = "max_completion_tokens" if self._is_gpt5 else "max_tokens"
     
-    async def generate(self, prompt: str, **kwargs) -> LLMResponse:
-        """Generate a response using OpenAI API."""
+    def _build_create_params(self, prompt: str, **kwargs) -> Dict:
+        """Assemble chat.completions.create params shared by all call styles."""
         temperature = kwargs.get("temperature", self.temperature)
         max_tokens = kwargs.get("max_tokens", self.max_tokens)
-        
-        # GPT-5 models have different parameter requirements
-        is_gpt5 = self.model.startswith("gpt-5")
-        
+
+        # Oversize prompts are rejected server-side only after the full
+        # upload; truncate locally so the round-trip is never wasted.
+        # 256 tokens of headroom cover the system message and framing.
+        enc = _enc(self.model) if tiktoken is not None else None
+        if enc is not None:
+            budget = _MODEL_CTX.get(self.model, _DEFAULT_CTX) - max_tokens - 256
+            ids = enc.encode(prompt)
+            if len(ids) > budget:
+                prompt = enc.decode(ids[:budget])
+
+        # Use temperature for all models (GPT-5 only supports 1.0, but we set it explicitly for consistency)
+        # Note: GPT-5 will error if temperature != 1.0, so config should use 1.0 for fair comparison
         create_params = {
             "model": self.model,
-            "messages": [
-                {"role": "system", "content": "You are an expert CV analyst with deep knowledge of recruitment and talent assessment."},
-                {"role": "user", "content": prompt}
-            ],
+            "messages": [_SYSTEM_MSG, {"role": "user", "content": prompt}],
+            "temperature": temperature,
+            self._tokens_key: max_tokens,
         }
+
+        # A stable key per invariant prefix steers requests sharing that
+        # prefix to the same cache shard, improving prompt-cache hit rates
+        cached_prefix = kwargs.get("cached_prefix")
+        if cached_prefix:
+            create_params["prompt_cache_key"] = hashlib.blake2b(
+                cached_prefix.encode(), digest_size=16
+            ).hexdigest()
+
+        return create_params
+
+    def count_tokens(self, text: str) -> int:
+        """Token count for this model's encoding (chars/4 without tiktoken).
+
+        Exposed so callers can bin-pack prompts against the context window
+        before submitting them.
+        """
+        enc = _enc(self.model) if tiktoken is not None else None
+        if enc is not None:
+            return len(enc.encode(text))
+        return len(text) // 4
+
+    async def generate(self, prompt: str, **kwargs) -> LLMResponse:
+        """Generate a response using OpenAI API."""
+        await self._throttle()
+        create_params = self._build_create_params(prompt, **kwargs)
+
+        response = await self._with_retry(
+            self.client.chat.completions.create, **create_params
+        )
         
-        # Use temperature for all models (GPT-5 only supports 1.0, but we set it explicitly for consistency)
-        # Note: GPT-5 will error if temperature != 1.0, so config should use 1.0 for fair comparison
-        create_params["temperature"] = temperature
-        
-        # Use appropriate parameter based on model version
-        if is_gpt5:
-            create_params["max_completion_tokens"] = max_tokens
-        else:
-            create_params["max_tokens"] = max_tokens
-        
-        response = await self.client.chat.completions.create(**create_params)
-        
-        return LLMResponse(
+        # model_construct skips field validation - these are trusted,
+        # provider-built values and this runs once per API call
+        return LLMResponse.model_construct(
             content=response.choices[0].message.content,
             model=self.model,
             usage={
@@ -53,6 +153,95 @@ class OpenAIProvider(LLMProvider):
             metadata={"finish_reason": response.choices[0].finish_reason}
         )
     
+    async def generate_stream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        """Yield response text incrementally as tokens arrive.
+
+        Lets callers start processing at first-chunk latency instead of
+        waiting for the slowest token of the full completion.
+        """
+        await self._throttle()
+        create_params = self._build_create_params(prompt, **kwargs)
+        stream = await self._with_retry(
+            self.client.chat.completions.create, stream=True, **create_params
+        )
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    async def generate_batch(self, prompts: List[str], **kwargs) -> List[LLMResponse]:
+        """Submit many independent prompts through the OpenAI Batch API.
+
+        Batched requests cost half the synchronous per-token price and are
+        throttled server-side, so rate limits stop being the caller's
+        problem - at the cost of minutes-scale turnaround. Only worth it
+        for offline runs that are not latency-critical.
+        """
+        temperature = kwargs.get("temperature", self.temperature)
+        max_tokens = kwargs.get("max_tokens", self.max_tokens)
+
+        lines = []
+        for i, prompt in enumerate(prompts):
+            body = {
+                "model": self.model,
+                "messages": [_SYSTEM_MSG, {"role": "user", "content": prompt}],
+                "temperature": temperature,
+                self._tokens_key: max_tokens,
+            }
+            lines.append(orjson.dumps({
+                "custom_id": str(i),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": body,
+            }))
+
+        input_file = await self.client.files.create(
+            file=("batch.jsonl", b"\n".join(lines)),
+            purpose="batch",
+        )
+        batch = await self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+
+        while batch.status in ("validating", "in_progress", "finalizing"):
+            await asyncio.sleep(5)
+            batch = await self.client.batches.retrieve(batch.id)
+
+        responses: List[LLMResponse] = [
+            LLMResponse(content="", model=self.model, metadata={"batch_error": "missing"})
+        ] * len(prompts)
+        if batch.output_file_id:
+            output = await self.client.files.content(batch.output_file_id)
+            for line in output.text.splitlines():
+                if not line.strip():
+                    continue
+                entry = orjson.loads(line)
+                idx = int(entry["custom_id"])
+                response = entry.get("response")
+                if response and response.get("status_code") == 200:
+                    body = response["body"]
+                    choice = body["choices"][0]
+                    usage = body.get("usage") or {}
+                    responses[idx] = LLMResponse.model_construct(
+                        content=choice["message"]["content"],
+                        model=self.model,
+                        usage={
+                            "prompt_tokens": usage.get("prompt_tokens", 0),
+                            "completion_tokens": usage.get("completion_tokens", 0),
+                            "total_tokens": usage.get("total_tokens", 0)
+                        },
+                        metadata={"finish_reason": choice.get("finish_reason"), "batched": True}
+                    )
+                else:
+                    error = entry.get("error") or (response or {}).get("status_code")
+                    responses[idx] = LLMResponse(
+                        content="",
+                        model=self.model,
+                        metadata={"batch_error": str(error)}
+                    )
+        return responses
+
     def get_provider_name(self) -> str:
         return "openai"
 